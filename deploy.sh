@@ -32,6 +32,9 @@ done
 
 echo "✓ All required environment variables are set"
 
+# Function sizing; memory also scales the CPU share Lambda allocates
+LAMBDA_MEMORY_SIZE="${LAMBDA_MEMORY_SIZE:-2048}"
+
 # Set ECR repository URI
 ECR_URI="$AWS_ACCOUNT_ID.dkr.ecr.$AWS_REGION.amazonaws.com/$ECR_REPOSITORY_NAME"
 
@@ -61,12 +64,67 @@ echo "Updating function configuration..."
 aws lambda update-function-configuration \
     --function-name "$LAMBDA_FUNCTION_NAME" \
     --architectures arm64 \
+    --memory-size "$LAMBDA_MEMORY_SIZE" \
     --environment "Variables={
         S3_BUCKET_NAME=$S3_BUCKET_NAME,
+        PARSER_INCLUDE_IMAGE_COUNT=${PARSER_INCLUDE_IMAGE_COUNT:-false},
+        LOG_LEVEL=INFO,
         CRAWL4_AI_BASE_DIRECTORY=/tmp/crawl4ai
     }" \
     --region "$AWS_REGION"
 
+# Report partial batch failures so SQS only redrives the failed records, and
+# let low traffic accumulate into full batches of 10 before invoking. Only the
+# mapping from the process queue is touched; the function may have others
+EVENT_SOURCE_UUID=""
+if [ -n "$PROCESS_QUEUE_URL" ]; then
+    PROCESS_QUEUE_ARN=$(aws sqs get-queue-attributes \
+        --queue-url "$PROCESS_QUEUE_URL" \
+        --attribute-names QueueArn \
+        --query 'Attributes.QueueArn' \
+        --output text \
+        --region "$AWS_REGION")
+    EVENT_SOURCE_UUID=$(aws lambda list-event-source-mappings \
+        --function-name "$LAMBDA_FUNCTION_NAME" \
+        --event-source-arn "$PROCESS_QUEUE_ARN" \
+        --query 'EventSourceMappings[0].UUID' \
+        --output text \
+        --region "$AWS_REGION")
+fi
+
+if [ -z "$EVENT_SOURCE_UUID" ] || [ "$EVENT_SOURCE_UUID" = "None" ]; then
+    echo "⚠️  No event source mapping from the process queue found, skipping mapping update"
+else
+    echo "Updating SQS event source mapping..."
+    aws lambda update-event-source-mapping \
+        --uuid "$EVENT_SOURCE_UUID" \
+        --function-response-types ReportBatchItemFailures \
+        --batch-size 10 \
+        --maximum-batching-window-in-seconds 5 \
+        --scaling-config MaximumConcurrency=10 \
+        --region "$AWS_REGION"
+fi
+
+# Keep the source queue's visibility timeout at six times the function timeout
+# (the AWS guidance for Lambda triggers), so in-flight batches are not handed
+# to a second invocation while the first is still retrying its sends
+if [ -n "$PROCESS_QUEUE_URL" ]; then
+    echo "Updating source queue visibility timeout..."
+    LAMBDA_TIMEOUT=$(aws lambda get-function-configuration \
+        --function-name "$LAMBDA_FUNCTION_NAME" \
+        --query 'Timeout' \
+        --output text \
+        --region "$AWS_REGION")
+    VISIBILITY_TIMEOUT=$((LAMBDA_TIMEOUT * 6))
+    if [ "$VISIBILITY_TIMEOUT" -gt 43200 ]; then
+        VISIBILITY_TIMEOUT=43200
+    fi
+    aws sqs set-queue-attributes \
+        --queue-url "$PROCESS_QUEUE_URL" \
+        --attributes VisibilityTimeout="$VISIBILITY_TIMEOUT" \
+        --region "$AWS_REGION"
+fi
+
 echo "🎉 Lambda update completed successfully!"
 echo "Function: $LAMBDA_FUNCTION_NAME"
 echo "Image: $ECR_URI:$IMAGE_TAG"
\ No newline at end of file
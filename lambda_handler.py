@@ -1,33 +1,86 @@
-import json
 import logging
+import os
+import time
 import traceback
-from typing import Dict, Any, List
+import types
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import orjson
+from botocore.exceptions import ConnectionError as BotoConnectionError, HTTPClientError
 
 from src.handler import Handler
 from src.services.s3_service import S3Service
-from src.repositories.sqs_repository import SQSRepository
-from src.models.messages import ProcessRequestMessage, ProcessSuccessMessage, ProcessFailureMessage
+from src.models.messages import ProcessRequestMessage, ProcessSuccessMessage, ContentType, EventType
 from src.exceptions.processing_exceptions import ProcessingException
-from src.config.settings import AppConfig
+from src.config.settings import AppConfig, get_config
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
 
-# Initialize services lazily to avoid init timeout
-config = None
-s3_service = None
-sqs_repository = None
-handler = None
 
-def get_handler():
-    global config, s3_service, sqs_repository, handler
-    if handler is None:
-        config = AppConfig()
-        s3_service = S3Service(config)
-        sqs_repository = SQSRepository(config)
-        handler = Handler(s3_service)
-    return handler, s3_service, sqs_repository, config
+def _log_level(name: str) -> int:
+    """Resolve a LOG_LEVEL value case-insensitively, falling back to INFO instead of failing INIT"""
+    level = logging.getLevelName(name.strip().upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+logger.setLevel(_log_level(os.environ.get('LOG_LEVEL', 'INFO')))
+
+# Connection and timeout errors from botocore that escape the services as-is
+# (the upload path; downloads raise S3DownloadException); these are transient,
+# while any other unexpected error is reported. Services flag transient
+# ProcessingExceptions (throttling, 5xx, connection drops) as retryable.
+TRANSIENT_EXCEPTIONS = (BotoConnectionError, HTTPClientError)
+
+# Error codes whose cause is fully described by the code and failed step
+# (request routing), so their failure messages carry no stack trace
+STACK_TRACE_OMITTED_CODES = frozenset({"NOT_IMPLEMENTED", "UNSUPPORTED_CONTENT_TYPE"})
+
+# Frames kept per exception, and total characters kept from the end, in
+# stack traces sent with failure messages (SQS caps messages at 256 KB)
+STACK_TRACE_LIMIT = 10
+STACK_TRACE_MAX_CHARS = 4096
+
+# Services are built on first use, or during INIT when running under Lambda.
+# Kept on one namespace so warm invocations check a single attribute.
+_STATE = types.SimpleNamespace(ready=False, config=None, s3=None, handler=None, sqs=None, executor=None)
+
+
+def get_processor() -> types.SimpleNamespace:
+    if not _STATE.ready:
+        _STATE.config = get_config()
+        _STATE.s3 = S3Service(_STATE.config)
+        _STATE.handler = Handler(_STATE.s3, include_image_count=_STATE.config.parser.include_image_count)
+        # One worker per record of a full receive batch, kept across warm invocations
+        _STATE.executor = ThreadPoolExecutor(
+            max_workers=_STATE.config.sqs.max_messages,
+            thread_name_prefix="record"
+        )
+        _STATE.ready = True
+    return _STATE
+
+
+def get_sqs():
+    # The SQS client is only needed right before a success/failure send,
+    # so keep its import and construction off the cold-start path.
+    if _STATE.sqs is None:
+        from src.repositories.sqs_repository import SQSRepository
+        _STATE.sqs = SQSRepository(get_processor().config)
+    return _STATE.sqs
+
+
+# Under Lambda, build the handler/parser graph and the SQS client during INIT,
+# touching the client's service model so botocore's model loading is billed
+# to the init phase rather than the first request. Locally both stay lazy.
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    try:
+        get_processor()
+        get_sqs().sqs_client.meta.service_model.operation_names
+    except Exception as e:
+        logger.warning(f"Failed to initialize services during init: {e}")
 
 
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
@@ -39,185 +92,229 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
         context: Lambda context object
         
     Returns:
-        Dict containing processing results and any failures
+        Dict in the SQS partial batch response format, listing the records
+        that should be redriven
     """
     logger.info("=== LAMBDA HANDLER STARTED ===")
-    logger.info(f"Raw event received: {json.dumps(event)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        # Re-serializing the whole batch is only worth it when diagnosing
+        logger.debug(f"Raw event received: {orjson.dumps(event).decode()}")
     logger.info(f"Event type: {type(event)}")
     logger.info(f"Event keys: {list(event.keys()) if isinstance(event, dict) else 'Not a dict'}")
     
     records = event.get('Records', [])
     logger.info(f"Found {len(records)} records in event")
     
-    results = []
+    state = get_processor()
+    
+    processed_count = 0
     failures = []
+    outgoing = []
     
-    for i, record in enumerate(records):
-        logger.info(f"=== Processing record {i+1}/{len(records)} ===")
-        logger.info(f"Record keys: {list(record.keys()) if isinstance(record, dict) else 'Not a dict'}")
-        logger.info(f"Message ID: {record.get('messageId', 'MISSING')}")
-        logger.info(f"Event source: {record.get('eventSource', 'MISSING')}")
-        logger.info(f"Raw body: {record.get('body', 'MISSING')}")
-        logger.info(f"Body type: {type(record.get('body'))}")
+    if records:
+        # Records are dominated by S3 and parser I/O, so overlap them across
+        # threads; results come back in record order through map()
+        process = partial(_process_record, handler=state.handler, s3_service=state.s3, config=state.config)
+        for record, (message, failure) in zip(records, state.executor.map(process, records)):
+            if message is not None:
+                outgoing.append((record.get('messageId'), message))
+                if isinstance(message, ProcessSuccessMessage):
+                    processed_count += 1
+            if failure is not None:
+                failures.append(failure)
+    
+    if outgoing:
+        # One SendMessageBatch call per 10 results instead of one send per record
         try:
-            # Parse SQS message
-            logger.info("Parsing JSON from record body...")
-            message_body = json.loads(record['body'])
-            logger.info(f"Parsed message body: {json.dumps(message_body)}")
-            logger.info(f"Message name: {message_body.get('name', 'MISSING')}")
-            logger.info(f"Message contentType: {message_body.get('contentType', 'MISSING')}")
-            
-            # Convert to ProcessRequestMessage
-            logger.info("Converting to ProcessRequestMessage...")
-            request = ProcessRequestMessage(**message_body)
-            logger.info(f"ProcessRequestMessage created: {request.name}, type: {request.content_type}")
-            
-            # Process the request (same as message_processor.py:56-60)
-            logger.info(f"Processing request for content ID: {request.content_id}")
-            handler, s3_service, sqs_repository, config = get_handler()
-            
-            start_time = datetime.utcnow()
-            processed_documents = handler.handle(request)
-            end_time = datetime.utcnow()
-            processing_time_ms = int((end_time - start_time).total_seconds() * 1000)
-            
-            logger.info(f"Handler processing completed, got {len(processed_documents)} documents")
-            
-            # Upload processed documents to S3 (same as message_processor.py:62-66)
-            logger.info("Uploading processed documents to S3...")
-            s3_key = s3_service.upload_processed_documents(
-                documents=processed_documents,
-                content_id=request.content_id
+            failed_indexes = get_sqs().send_message_batch(
+                queue_url=state.config.sqs.processing_queue_url,
+                messages=[message for _, message in outgoing]
             )
-            logger.info(f"Documents uploaded to S3: {s3_key}")
-            
-            # Send success response (same as message_processor.py:68-77)
-            logger.info("Sending success message to processing queue...")
-            success_message = ProcessSuccessMessage(
-                contentId=request.content_id,
-                contentType=request.content_type,
-                message="Document processed successfully",
-                processingTimeMs=processing_time_ms,
-                chunkCount=len(processed_documents),
-                s3BucketName=config.s3.bucket_name,
-                s3Key=s3_key
-            )
-            
-            # Send to processing queue (same as message_processor.py:79-82)
-            sqs_repository.send_message(
-                queue_url=config.sqs.processing_queue_url,
-                message=success_message
-            )
-            
-            # Lambda automatically deletes SQS message on success (no need for manual delete)
-            logger.info(f"Successfully processed content ID: {request.content_id}")
-            logger.info(f"Processing time: {processing_time_ms}ms, Chunks: {len(processed_documents)}")
-            
-            results.append({
-                'messageId': record.get('messageId'),
-                'name': request.name,
-                'contentType': request.content_type.value,
-                'chunksGenerated': len(processed_documents),
-                'status': 'success'
-            })
-            
-        except json.JSONDecodeError as e:
-            error_msg = f"Invalid JSON in SQS message: {str(e)}"
-            logger.error(error_msg)
+        except Exception as e:
+            logger.error(f"Error sending result messages: {e}")
+            failed_indexes = range(len(outgoing))
+        
+        # Redrive records whose result never reached the processing queue
+        for index in failed_indexes:
             failures.append({
-                'messageId': record.get('messageId'),
-                'error': error_msg,
-                'errorType': 'JSON_DECODE_ERROR'
+                'messageId': outgoing[index][0],
+                'error': "Failed to send result message",
+                'errorType': 'SQS_SEND_ERROR'
             })
-            
-        except ProcessingException as e:
-            # Handle processing error (same as message_processor.py:97-120)
-            logger.error(f"Processing failed for message {record.get('messageId')}: {str(e)}")
-            try:
-                message_body = json.loads(record['body'])
-                request = ProcessRequestMessage(**message_body)
-                
-                handler, s3_service, sqs_repository, config = get_handler()
-                
-                failure_message = ProcessFailureMessage(
-                    contentId=request.content_id,
-                    contentType=request.content_type,
-                    errorMessage=str(e),
-                    errorCode=e.error_code,
-                    stackTrace=traceback.format_exc(),
-                    retryCount=0,
-                    failedStep=e.failed_step
-                )
-                
-                sqs_repository.send_message(
-                    queue_url=config.sqs.processing_queue_url,
-                    message=failure_message
-                )
-                
-                logger.error(f"Processing failed for content ID: {request.content_id}")
-                
-            except Exception as send_error:
-                logger.error(f"Error sending failure message: {send_error}")
-            
-            failures.append({
+    
+    if failures:
+        logger.warning(f"Processing completed with {len(failures)} records returned for redrive out of {len(records)} records")
+    else:
+        logger.info(f"All {len(records)} records handled, {processed_count} processed successfully")
+    
+    return batch_failure_handler(failures)
+
+
+def _process_record(
+    record: Dict[str, Any],
+    handler: Handler,
+    s3_service: S3Service,
+    config: AppConfig
+) -> Tuple[Optional[Union[ProcessSuccessMessage, Dict[str, Any]]], Optional[Dict[str, Any]]]:
+    """
+    Process a single SQS record.
+    
+    Args:
+        record: SQS record containing the request body
+        handler: Handler routing the request to a parser
+        s3_service: S3 service used to upload the processed documents
+        config: Application configuration
+        
+    Returns:
+        Tuple of the message to send to the processing queue (if any) and
+        the failure entry to redrive the record with (if any)
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Raw body: {record.get('body', 'MISSING')}")
+    # Parsed once and reused by the failure branches below
+    request = None
+    try:
+        # Parse and validate the SQS message body in a single pass
+        request = ProcessRequestMessage.model_validate_json(record['body'])
+        
+        # Process the request (same as message_processor.py:56-60)
+        start_ns = time.perf_counter_ns()
+        processed_documents = handler.handle(request)
+        processing_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+        
+        # Upload processed documents to S3 (same as message_processor.py:62-66)
+        s3_key = s3_service.upload_processed_documents(
+            documents=processed_documents,
+            content_id=request.content_id
+        )
+        
+        # Success response, sent with the rest of the batch by lambda_handler
+        success_message = ProcessSuccessMessage(
+            contentId=request.content_id,
+            contentType=request.content_type,
+            message="Document processed successfully",
+            processingTimeMs=processing_time_ms,
+            chunkCount=len(processed_documents),
+            s3BucketName=config.s3.bucket_name,
+            s3Key=s3_key
+        )
+        
+        # Lambda automatically deletes SQS message on success (no need for manual delete)
+        # One structured line per record instead of a line per field
+        log_ctx = {
+            'messageId': record.get('messageId'),
+            'contentId': request.content_id,
+            'contentType': request.content_type.value,
+            'chunksGenerated': len(processed_documents),
+            'processingTimeMs': processing_time_ms,
+            's3Key': s3_key
+        }
+        logger.info(f"Record processed: {orjson.dumps(log_ctx).decode()}")
+        
+        return success_message, None
+        
+    except ProcessingException as e:
+        logger.error(f"Processing failed for message {record.get('messageId')}: {str(e)}")
+        
+        if e.retryable:
+            # Let SQS redrive the record instead of reporting a failure
+            return None, {
                 'messageId': record.get('messageId'),
                 'error': str(e),
                 'errorType': 'PROCESSING_ERROR',
                 'errorCode': e.error_code,
                 'failedStep': e.failed_step
-            })
-            
-        except Exception as e:
-            # Handle unexpected error (same as message_processor.py:122-147)
-            logger.error(f"Unexpected error processing message {record.get('messageId')}: {str(e)}")
-            try:
-                message_body = json.loads(record['body'])
-                content_id = message_body.get('contentId', 'unknown')
-                content_type = message_body.get('contentType', 'document')
-                
-                handler, s3_service, sqs_repository, config = get_handler()
-                
-                failure_message = ProcessFailureMessage(
-                    contentId=content_id,
-                    contentType=content_type,
-                    errorMessage=f"Unexpected error: {str(e)}",
-                    errorCode="UNEXPECTED_ERROR",
-                    stackTrace=traceback.format_exc(),
-                    retryCount=0,
-                    failedStep="message_processing"
-                )
-                
-                sqs_repository.send_message(
-                    queue_url=config.sqs.processing_queue_url,
-                    message=failure_message
-                )
-                
-                logger.error(f"Unexpected error processing message: {e}")
-                
-            except Exception as send_error:
-                logger.critical(f"Critical error in error handling: {send_error}")
-            
-            failures.append({
+            }
+        
+        logger.error(f"Processing failed for content ID: {request.content_id}")
+        return _failure_body(
+            content_id=request.content_id,
+            content_type=request.content_type.value,
+            error_message=str(e),
+            error_code=e.error_code,
+            stack_trace=None if e.error_code in STACK_TRACE_OMITTED_CODES else _format_stack(e),
+            failed_step=e.failed_step
+        ), None
+        
+    except Exception as e:
+        logger.error(f"Unexpected error processing message {record.get('messageId')}: {str(e)}")
+        
+        if request is not None and isinstance(e, TRANSIENT_EXCEPTIONS):
+            # AWS connectivity failed mid-record, so let SQS redrive it
+            return None, {
                 'messageId': record.get('messageId'),
                 'error': str(e),
-                'errorType': 'UNEXPECTED_ERROR'
-            })
+                'errorType': 'TRANSIENT_ERROR'
+            }
+        
+        if request is not None:
+            # Anything else on a valid request is a bug that a redrive would
+            # only repeat, so report it to the processing queue
+            content_id = request.content_id
+            content_type = request.content_type.value
+        else:
+            try:
+                # Request validation failed, fall back to the raw body
+                raw_body = orjson.loads(record['body'])
+            except orjson.JSONDecodeError as json_error:
+                # Malformed JSON never succeeds on redrive, so drop the record
+                logger.error(f"Invalid JSON in SQS message {record.get('messageId')}: {str(json_error)}")
+                return None, None
+            
+            if not isinstance(raw_body, dict):
+                raw_body = {}
+            
+            try:
+                content_type = ContentType(raw_body.get('contentType', 'document')).value
+            except ValueError as type_error:
+                logger.critical(f"Critical error in error handling: {type_error}")
+                return None, None
+            content_id = raw_body.get('contentId', 'unknown')
+        
+        return _failure_body(
+            content_id=content_id,
+            content_type=content_type,
+            error_message=f"Unexpected error: {str(e)}",
+            error_code="UNEXPECTED_ERROR",
+            stack_trace=_format_stack(e),
+            failed_step="message_processing"
+        ), None
+
+
+def _format_stack(error: BaseException) -> str:
+    """Format a bounded stack trace for an error, only when a failure message needs it"""
+    stack_trace = ''.join(traceback.format_exception(type(error), error, error.__traceback__, limit=STACK_TRACE_LIMIT))
+    # Keep the tail, where the innermost frames and the exception message are
+    return stack_trace[-STACK_TRACE_MAX_CHARS:]
+
+
+def _failure_body(
+    content_id: str,
+    content_type: str,
+    error_message: str,
+    error_code: str,
+    stack_trace: Optional[str],
+    failed_step: str
+) -> Dict[str, Any]:
+    """
+    Build a failure message body as a plain dict.
     
-    # Return results
-    response = {
-        'statusCode': 200 if not failures else 207,  # 207 for partial success
-        'processedCount': len(results),
-        'failureCount': len(failures),
-        'results': results
+    Produces the same JSON as ProcessFailureMessage.model_dump_json(by_alias=True)
+    while skipping pydantic validation, since every field is already known to
+    be well formed on the error path.
+    """
+    return {
+        'eventId': str(uuid.uuid4()),
+        'eventType': EventType.CONTENT_PROCESS_FAILED.value,
+        'timestamp': datetime.utcnow().isoformat(),
+        'contentId': content_id,
+        'contentType': content_type,
+        'errorMessage': error_message,
+        'errorCode': error_code,
+        'stackTrace': stack_trace,
+        'retryCount': 0,
+        'failedStep': failed_step
     }
-    
-    if failures:
-        response['failures'] = failures
-        logger.warning(f"Processing completed with {len(failures)} failures out of {len(event.get('Records', []))} records")
-    else:
-        logger.info(f"All {len(results)} records processed successfully")
-    
-    return response
 
 
 def batch_failure_handler(failures: List[Dict[str, Any]]) -> Dict[str, Any]:
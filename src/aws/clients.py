@@ -0,0 +1,49 @@
+from functools import lru_cache
+import os
+import boto3
+from botocore.config import Config as BotoConfig
+
+from src.config.settings import AppConfig
+
+# Large object downloads and multipart part uploads can legitimately go quiet
+# for longer than the shared 5s read timeout, which is meant for SQS calls
+S3_READ_TIMEOUT = 60
+
+
+@lru_cache(maxsize=None)
+def get_session(config: AppConfig) -> boto3.session.Session:
+    """
+    Return the boto3 session shared by every client built from this config.
+    
+    Args:
+        config: Application configuration with the AWS settings
+        
+    Returns:
+        boto3.session.Session: Session with the region and, locally, explicit credentials
+    """
+    # Check if running in Lambda (AWS_LAMBDA_FUNCTION_NAME is set by Lambda)
+    if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+        # In Lambda: use IAM role, don't specify credentials
+        return boto3.session.Session(region_name=config.aws.region)
+    # Locally: use explicit credentials
+    return boto3.session.Session(
+        region_name=config.aws.region,
+        aws_access_key_id=config.aws.access_key_id,
+        aws_secret_access_key=config.aws.secret_access_key
+    )
+
+
+@lru_cache(maxsize=None)
+def get_sqs_client(config: AppConfig):
+    """Return the process-wide SQS client for this config"""
+    return get_session(config).client('sqs', config=config.boto_client_config)
+
+
+@lru_cache(maxsize=None)
+def get_s3_client(config: AppConfig):
+    """Return the process-wide S3 client for this config"""
+    client_config = config.boto_client_config.merge(BotoConfig(
+        s3={'addressing_style': 'virtual'},
+        read_timeout=S3_READ_TIMEOUT
+    ))
+    return get_session(config).client('s3', config=client_config)
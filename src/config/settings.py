@@ -1,9 +1,13 @@
+from functools import lru_cache
+from botocore.config import Config as BotoConfig
 from pydantic_settings import BaseSettings
 from typing import Optional
 import os
 from dotenv import load_dotenv
 
-load_dotenv('.env.dev')
+# Lambda gets its settings from the function environment, no .env file
+if not os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    load_dotenv('.env.dev')
 
 
 class AWSConfig(BaseSettings):
@@ -27,17 +31,43 @@ class SQSConfig(BaseSettings):
 
 class S3Config(BaseSettings):
     bucket_name: str
+    # gzip processed chunk uploads (Content-Encoding: gzip); off by default
+    # because S3 GetObject does not decompress for the consumer
+    compress_uploads: bool = False
     
     class Config:
         env_prefix = "S3_"
 
 
+class ParserConfig(BaseSettings):
+    # Add page_image_count to document page metadata; off by default because
+    # walking every page's image resources slows extraction down
+    include_image_count: bool = False
+    
+    class Config:
+        env_prefix = "PARSER_"
+
+
 class AppConfig:
     def __init__(self):
         self.aws = AWSConfig()
         self.sqs = SQSConfig()
         self.s3 = S3Config()
+        self.parser = ParserConfig()
+        # Shared by every boto3 client: a keep-alive pool at least as large as
+        # the number of concurrent records, adaptive retries that back off on
+        # throttling and bounded timeouts so a stalled connection fails fast
+        # instead of eating the invocation budget. The short read timeout
+        # suits SQS calls; the S3 client overrides it in src/aws/clients.py
+        self.boto_client_config = BotoConfig(
+            max_pool_connections=max(50, self.sqs.max_messages),
+            tcp_keepalive=True,
+            retries={'mode': 'adaptive', 'max_attempts': 5},
+            connect_timeout=2,
+            read_timeout=5
+        )
 
 
+@lru_cache(maxsize=1)
 def get_config() -> AppConfig:
     return AppConfig()
\ No newline at end of file
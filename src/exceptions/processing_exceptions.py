@@ -1,8 +1,12 @@
 class ProcessingException(Exception):
-    def __init__(self, message: str, error_code: str, failed_step: str):
+    __slots__ = ('error_code', 'failed_step', 'retryable')
+    
+    def __init__(self, message: str, error_code: str, failed_step: str, retryable: bool = False):
         super().__init__(message)
         self.error_code = error_code
         self.failed_step = failed_step
+        # Whether the failure is transient and worth a redrive through SQS
+        self.retryable = retryable
 
 
 class DocumentProcessingException(ProcessingException):
@@ -11,13 +15,13 @@ class DocumentProcessingException(ProcessingException):
 
 
 class S3UploadException(ProcessingException):
-    def __init__(self, message: str, failed_step: str = "s3_upload"):
-        super().__init__(message, "S3_UPLOAD_ERROR", failed_step)
+    def __init__(self, message: str, failed_step: str = "s3_upload", retryable: bool = True):
+        super().__init__(message, "S3_UPLOAD_ERROR", failed_step, retryable)
 
 
 class S3DownloadException(ProcessingException):
-    def __init__(self, message: str, failed_step: str = "s3_download"):
-        super().__init__(message, "S3_DOWNLOAD_ERROR", failed_step)
+    def __init__(self, message: str, failed_step: str = "s3_download", retryable: bool = True):
+        super().__init__(message, "S3_DOWNLOAD_ERROR", failed_step, retryable)
 
 
 class SQSMessageException(ProcessingException):
@@ -1,5 +1,5 @@
 import logging
-from typing import List
+from typing import Callable, Dict, List
 
 from .models.messages import ProcessRequestMessage, SpringAIDocument, ContentType
 from .parsers.document_parser import DocumentParser
@@ -9,24 +9,38 @@ from .exceptions.processing_exceptions import ProcessingException
 
 logger = logging.getLogger(__name__)
 
+# Content types that are recognised but have no parser yet
+NOT_IMPLEMENTED_MESSAGES: Dict[ContentType, str] = {
+    ContentType.IMAGE: "Image processing not yet implemented",
+    ContentType.VIDEO: "Video processing not yet implemented",
+    ContentType.AUDIO: "Audio processing not yet implemented",
+}
+
 
 class Handler:
     """
     Simple handler that routes ProcessRequestMessage to appropriate parsers.
     """
     
-    def __init__(self, s3_service: S3ServiceInterface):
+    def __init__(self, s3_service: S3ServiceInterface, include_image_count: bool = False):
         """
         Initialize the handler.
         
         Args:
             s3_service: S3 service to pass to parsers
+            include_image_count: Add page_image_count to document page metadata (default: False)
         """
         # Initialize parsers with dependencies they need
-        self.document_parser = DocumentParser(s3_service)
+        self.document_parser = DocumentParser(s3_service, include_image_count=include_image_count)
         self.web_parser = WebParser()
         # Future parsers:
         # self.image_parser = ImageParser(s3_service)
+        
+        # Dispatch table from content type to parser, built once
+        self._parsers: Dict[ContentType, Callable[[ProcessRequestMessage], List[SpringAIDocument]]] = {
+            ContentType.DOCUMENT: self.document_parser.parse,
+            ContentType.WEB: self.web_parser.parse,
+        }
     
     def handle(self, request: ProcessRequestMessage) -> List[SpringAIDocument]:
         """
@@ -44,34 +58,23 @@ class Handler:
         try:
             logger.info(f"Routing {request.content_type} request: {request.name}")
             
-            if request.content_type == ContentType.DOCUMENT:
-                return self.document_parser.parse(request)
-            elif request.content_type == ContentType.WEB:
-                return self.web_parser.parse(request)
-            elif request.content_type == ContentType.IMAGE:
-                raise ProcessingException(
-                    "Image processing not yet implemented",
-                    error_code="NOT_IMPLEMENTED",
-                    failed_step="parser_selection"
-                )
-            elif request.content_type == ContentType.VIDEO:
-                raise ProcessingException(
-                    "Video processing not yet implemented",
-                    error_code="NOT_IMPLEMENTED", 
-                    failed_step="parser_selection"
-                )
-            elif request.content_type == ContentType.AUDIO:
+            parse = self._parsers.get(request.content_type)
+            if parse is not None:
+                return parse(request)
+            
+            not_implemented_message = NOT_IMPLEMENTED_MESSAGES.get(request.content_type)
+            if not_implemented_message is not None:
                 raise ProcessingException(
-                    "Audio processing not yet implemented",
+                    not_implemented_message,
                     error_code="NOT_IMPLEMENTED",
                     failed_step="parser_selection"
                 )
-            else:
-                raise ProcessingException(
-                    f"Unsupported content type: {request.content_type}",
-                    error_code="UNSUPPORTED_CONTENT_TYPE",
-                    failed_step="parser_selection"
-                )
+            
+            raise ProcessingException(
+                f"Unsupported content type: {request.content_type}",
+                error_code="UNSUPPORTED_CONTENT_TYPE",
+                failed_step="parser_selection"
+            )
                 
         except ProcessingException:
             # Re-raise processing exceptions as-is
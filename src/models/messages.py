@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer, field_validator
 from typing import Optional, Dict, Any
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum
 import uuid
@@ -59,6 +60,54 @@ class ProcessFailureMessage(BaseMessage):
     failed_step: str = Field(alias="failedStep")
 
 
+@dataclass(slots=True)
+class ChunkMetadata:
+    # Fixed per-chunk fields; parser-specific top-level keys go in extra
+    knowledge_id: str
+    processing_timestamp: str
+    name: str
+    mime_type: str
+    chunk_index: int
+    token_count: int
+    chunk_start_index: int
+    chunk_end_index: int
+    additional_payload: Dict[str, Any]
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "knowledge_id": self.knowledge_id,
+            "processing_timestamp": self.processing_timestamp,
+            "name": self.name,
+            "mime_type": self.mime_type,
+            **self.extra,
+            "chunk_index": self.chunk_index,
+            "token_count": self.token_count,
+            "chunk_start_index": self.chunk_start_index,
+            "chunk_end_index": self.chunk_end_index,
+            "additional_payload": self.additional_payload,
+        }
+
+
+CHUNK_METADATA_FIELDS = frozenset(chunk_field.name for chunk_field in fields(ChunkMetadata))
+
+
 class SpringAIDocument(BaseModel):
     content: str
-    metadata: Dict[str, Any]
+    metadata: ChunkMetadata
+
+    @field_validator("metadata", mode="before")
+    @classmethod
+    def validate_metadata(cls, metadata: Any) -> Any:
+        # Flat metadata dicts (e.g. read back from S3) keep parser-specific keys in extra
+        if isinstance(metadata, dict):
+            known = {key: value for key, value in metadata.items() if key in CHUNK_METADATA_FIELDS}
+            extra = {key: value for key, value in metadata.items() if key not in CHUNK_METADATA_FIELDS}
+            if extra:
+                known["extra"] = {**known.get("extra", {}), **extra}
+            return known
+        return metadata
+
+    @field_serializer("metadata")
+    def serialize_metadata(self, metadata: ChunkMetadata) -> Dict[str, Any]:
+        return metadata.to_dict()
@@ -0,0 +1,30 @@
+from functools import lru_cache
+from chonkie import SentenceChunker
+
+
+@lru_cache(maxsize=8)
+def get_chunker(chunk_size: int, overlap: int) -> SentenceChunker:
+    """
+    Return a shared SentenceChunker for the given chunking parameters.
+    
+    Building a chunker loads the GPT-2 tokenizer, so instances are cached and
+    reused across requests; SentenceChunker keeps no per-call state.
+    
+    Args:
+        chunk_size: Maximum tokens per chunk
+        overlap: Number of tokens to overlap between chunks
+        
+    Returns:
+        SentenceChunker: Chunker configured for the given parameters
+    """
+    chunker = SentenceChunker(
+        tokenizer_or_token_counter="gpt2",
+        chunk_size=chunk_size,
+        chunk_overlap=overlap,
+        min_sentences_per_chunk=1
+    )
+    # chunk_batch would otherwise fan out to a multiprocessing Pool,
+    # which Lambda cannot create and which costs more than it saves
+    # for a single request's texts
+    chunker._use_multiprocessing = False
+    return chunker
\ No newline at end of file
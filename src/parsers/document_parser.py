@@ -1,15 +1,92 @@
 import pymupdf
-import tempfile
+import io
 import os
+import tempfile
 import logging
-from typing import List, Dict, Any
-from chonkie import SentenceChunker
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import List, Dict, Any, Sequence, Tuple
 from .base_parser import BaseParser
-from ..models.messages import SpringAIDocument, ProcessRequestMessage
+from .chunking import get_chunker
+from ..exceptions.processing_exceptions import ProcessingException
+from ..models.messages import SpringAIDocument, ProcessRequestMessage, ChunkMetadata
 from ..services.s3_service import S3ServiceInterface
 
 logger = logging.getLogger(__name__)
 
+# Keep MuPDF from echoing errors and warnings (e.g. broken xref tables) to
+# stderr; failures still surface as exceptions. Runs in page workers too.
+pymupdf.TOOLS.mupdf_display_errors(False)
+pymupdf.TOOLS.mupdf_display_warnings(False)
+
+_PYMUPDF_LOCK = threading.Lock()
+
+# Documents with at least this many pages have their text extracted in worker processes
+PARALLEL_PAGE_THRESHOLD = 8
+MAX_PAGE_WORKERS = 4
+
+# Workers must not be forked from this process: other record threads may be
+# inside MuPDF or holding logging/boto locks at fork time. The fork server is a
+# clean single-threaded process that has this module preloaded.
+if "forkserver" in multiprocessing.get_all_start_methods():
+    _MP_CONTEXT = multiprocessing.get_context("forkserver")
+    _MP_CONTEXT.set_forkserver_preload([__name__])
+else:
+    _MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# Cleared the first time a process pool cannot be created (e.g. AWS Lambda,
+# which has no /dev/shm), so later documents go straight to sequential extraction
+_process_pool_available = True
+
+# PyMuPDF filetypes for known MIME types, so the format does not have to be guessed
+_MIME_TO_FILETYPE = {
+    "application/pdf": "pdf",
+    "application/epub+zip": "epub",
+    "application/x-mobipocket-ebook": "mobi",
+    "application/oxps": "xps",
+    "application/vnd.ms-xpsdocument": "xps",
+    "application/x-fictionbook+xml": "fb2",
+    "application/vnd.comicbook+zip": "cbz",
+    "application/x-cbz": "cbz",
+    "image/svg+xml": "svg",
+    "text/plain": "txt",
+}
+
+# Plain text extraction without image blocks
+TEXT_FLAGS = pymupdf.TEXTFLAGS_TEXT & ~pymupdf.TEXT_PRESERVE_IMAGES
+
+# (page index, text, width, height, rotation, image count)
+PageContent = Tuple[int, str, float, float, int, int]
+
+
+def _read_pages(doc: pymupdf.Document, page_numbers: Sequence[int], include_image_count: bool = False) -> List[PageContent]:
+    """Read text and layout details for the non-empty pages among the given pages of an open document"""
+    pages = []
+    for page_num in page_numbers:
+        page = doc[page_num]
+        page_text = page.get_text("text", flags=TEXT_FLAGS).strip()
+        if not page_text:  # Skip empty pages before any layout lookups
+            continue
+        pages.append((
+            page_num,
+            page_text,
+            page.rect.width,
+            page.rect.height,
+            page.rotation,
+            # Walking the page resources is only worth it when the count is wanted
+            len(page.get_images()) if include_image_count else 0
+        ))
+    return pages
+
+
+def _extract_pages(file_path: str, filetype: str, include_image_count: bool, page_numbers: Sequence[int]) -> List[PageContent]:
+    """Open a document file and read the given pages; used by page extraction workers"""
+    with pymupdf.open(file_path, filetype=filetype) as doc:
+        return _read_pages(doc, page_numbers, include_image_count)
+
 
 class DocumentParser(BaseParser):
     """
@@ -18,14 +95,16 @@ class DocumentParser(BaseParser):
     Handles S3 download, document parsing, and chunking into SpringAI documents.
     """
     
-    def __init__(self, s3_service: S3ServiceInterface):
+    def __init__(self, s3_service: S3ServiceInterface, include_image_count: bool = False):
         """
         Initialize the DocumentParser.
         
         Args:
             s3_service: S3 service for downloading files
+            include_image_count: Add page_image_count to the page metadata (default: False)
         """
         self.s3_service = s3_service
+        self.include_image_count = include_image_count
     
     def parse(self, request: ProcessRequestMessage, chunk_size: int = 512, overlap: int = 128) -> List[SpringAIDocument]:
         """
@@ -42,124 +121,179 @@ class DocumentParser(BaseParser):
         Raises:
             Exception: If parsing fails
         """
-        temp_file_path = None
         try:
             logger.info(f"Processing document: {request.name} from S3")
             
-            # Download file from S3
-            file_content = self.s3_service.download_file(
+            # Stream the file from S3 into memory; the filetype comes from the
+            # MIME type, with the file extension as a fallback hint
+            file_extension = request.name.split('.')[-1] if '.' in request.name else 'bin'
+            filetype = _MIME_TO_FILETYPE.get(request.mime_type, file_extension)
+            file_buffer = io.BytesIO()
+            self.s3_service.download_to_fileobj(
                 s3_key=request.s3_key,
-                s3_bucket=request.s3_bucket
+                s3_bucket=request.s3_bucket,
+                fileobj=file_buffer
             )
             
-            # Create temporary file with proper extension
-            file_extension = request.name.split('.')[-1] if '.' in request.name else 'bin'
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
-            
-            logger.debug(f"Downloaded file to: {temp_file_path}")
-            
-            # Parse the document
-            doc = pymupdf.open(temp_file_path)
+            logger.debug(f"Downloaded {file_buffer.tell()} bytes into memory")
             
-            # Extract document metadata
-            doc_metadata = {
-                "title": doc.metadata.get("title", ""),
-                "author": doc.metadata.get("author", ""),
-                "subject": doc.metadata.get("subject", ""),
-                "creator": doc.metadata.get("creator", ""),
-                "producer": doc.metadata.get("producer", ""),
-                "creation_date": doc.metadata.get("creationDate", ""),
-                "modification_date": doc.metadata.get("modDate", ""),
-                "total_pages": len(doc),
-                "source": request.name
-            }
+            # PyMuPDF is not thread-safe and records are processed on a
+            # thread pool, so only one document is parsed at a time
+            with _PYMUPDF_LOCK:
+                # Parse the document
+                doc = pymupdf.open(stream=file_buffer.getbuffer(), filetype=filetype)
+                try:
+                    # Extract document metadata; Document.metadata is a property, read it once
+                    raw_metadata = doc.metadata or {}
+                    page_count = len(doc)
+                    doc_metadata = {
+                        "title": raw_metadata.get("title", ""),
+                        "author": raw_metadata.get("author", ""),
+                        "subject": raw_metadata.get("subject", ""),
+                        "creator": raw_metadata.get("creator", ""),
+                        "producer": raw_metadata.get("producer", ""),
+                        "creation_date": raw_metadata.get("creationDate", ""),
+                        "modification_date": raw_metadata.get("modDate", ""),
+                        "total_pages": page_count,
+                        "source": request.name
+                    }
+                    
+                    pages = None
+                    if page_count < PARALLEL_PAGE_THRESHOLD:
+                        pages = _read_pages(doc, range(page_count), self.include_image_count)
+                finally:
+                    doc.close()
             
-            # Initialize Chonkie SentenceChunker
-            chunker = SentenceChunker(
-                tokenizer_or_token_counter="gpt2",
-                chunk_size=chunk_size,
-                chunk_overlap=overlap,
-                min_sentences_per_chunk=1
-            )
+            if pages is None:
+                pages = self._extract_pages_parallel(file_buffer.getbuffer(), filetype, page_count)
             
-            spring_ai_documents = []
-            global_chunk_index = 0
+            # Shared Chonkie SentenceChunker for these parameters
+            chunker = get_chunker(chunk_size, overlap)
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                page_text = page.get_text().strip()
-                page_number = page_num + 1  # 1-indexed page numbers
-                
-                if not page_text:  # Skip empty pages
-                    continue
-                
+            # Collect the pages first so they can be chunked in one batch;
+            # empty pages were already dropped during extraction
+            page_entries = []
+            for page_num, page_text, page_width, page_height, page_rotation, image_count in pages:
                 # Extract page metadata
                 page_metadata = {
-                    "page_width": page.rect.width,
-                    "page_height": page.rect.height,
-                    "page_rotation": page.rotation,
+                    "page_width": page_width,
+                    "page_height": page_height,
+                    "page_rotation": page_rotation,
                 }
                 
                 # Add image count if any
-                image_list = page.get_images()
-                if image_list:
-                    page_metadata["page_image_count"] = len(image_list)
+                if image_count:
+                    page_metadata["page_image_count"] = image_count
                 
-                # Use Chonkie to chunk the page text
-                chonkie_chunks = chunker.chunk(page_text)
+                page_entries.append((page_num + 1, page_text, page_metadata))  # 1-indexed page numbers
+            
+            # Use Chonkie to chunk all page texts in one batch
+            page_chunks = chunker.chunk_batch([page_text for _, page_text, _ in page_entries], show_progress=False)
+            
+            # Document specific top-level fields, identical for every chunk
+            doc_fields = {
+                "file_size": request.file_size,
+                # "s3_bucket": request.s3_bucket,
+                # "s3_key": request.s3_key,
+            }
+            doc_payload = {f"doc_{key}": value for key, value in doc_metadata.items() if value}
+            
+            # Every chunk becomes one document, so the list can be sized up front
+            spring_ai_documents = [None] * sum(len(chonkie_chunks) for chonkie_chunks in page_chunks)
+            global_chunk_index = 0
+            
+            for (page_number, _, page_metadata), chonkie_chunks in zip(page_entries, page_chunks):
+                # Format-specific data in additional_payload, built once per page
+                page_payload = {
+                    # PDF/document specific metadata
+                    "page_number": page_number,
+                    **doc_payload,
+                    **page_metadata
+                }
                 
                 for chonkie_chunk in chonkie_chunks:
-                    # Create metadata with important generic fields first
-                    chunk_metadata = {
+                    chunk_metadata = ChunkMetadata(
                         # Important generic fields for all parsers
-                        "knowledge_id": request.content_id,
-                        "processing_timestamp": request.timestamp,
-                        # "project_id": request.project_id,
-                        # "user_id": request.user_id,
-                        "name": request.name,
-                        "mime_type": request.mime_type,
-                        "file_size": request.file_size,
-                        # "s3_bucket": request.s3_bucket,
-                        # "s3_key": request.s3_key,
+                        knowledge_id=request.content_id,
+                        processing_timestamp=request.timestamp,
+                        name=request.name,
+                        mime_type=request.mime_type,
                         
                         # Chunking metadata
-                        "chunk_index": global_chunk_index,
-                        "token_count": chonkie_chunk.token_count,
-                        "chunk_start_index": chonkie_chunk.start_index,
-                        "chunk_end_index": chonkie_chunk.end_index,
+                        chunk_index=global_chunk_index,
+                        token_count=chonkie_chunk.token_count,
+                        chunk_start_index=chonkie_chunk.start_index,
+                        chunk_end_index=chonkie_chunk.end_index,
                         
-                        # Format-specific data in additional_payload
-                        "additional_payload": {
-                            # PDF/document specific metadata
-                            "page_number": page_number,
-                            **{f"doc_{key}": value for key, value in doc_metadata.items() if value},
-                            **page_metadata
-                        }
-                    }
+                        # Copied so each chunk's metadata can be changed on its own
+                        additional_payload=dict(page_payload),
+                        extra=dict(doc_fields)
+                    )
                     
                     # Create SpringAIDocument
                     spring_ai_doc = SpringAIDocument(
                         content=chonkie_chunk.text,
                         metadata=chunk_metadata
                     )
-                    spring_ai_documents.append(spring_ai_doc)
+                    spring_ai_documents[global_chunk_index] = spring_ai_doc
                     global_chunk_index += 1
             
-            doc.close()
             logger.info(f"Successfully processed document into {len(spring_ai_documents)} chunks")
             return spring_ai_documents
             
+        except ProcessingException:
+            # Keep coded errors such as S3DownloadException intact so the
+            # Lambda handler can tell transient failures apart
+            raise
         except Exception as e:
             logger.error(f"Error processing document: {e}")
             raise Exception(f"Failed to parse document {request.name}: {str(e)}")
+    
+    def _extract_pages_parallel(self, data: memoryview, filetype: str, page_count: int) -> List[PageContent]:
+        """
+        Extract pages in worker processes, each opening the document for its own page range.
+        
+        Workers read the document from a temporary file that is removed as soon as
+        extraction finishes, rather than each being sent a pickled copy of the bytes.
+        Falls back to sequential in-memory extraction where process pools are
+        unavailable (e.g. AWS Lambda, which has no /dev/shm for multiprocessing).
+        
+        Args:
+            data: Raw document bytes
+            filetype: Filetype hint passed to PyMuPDF
+            page_count: Number of pages in the document
             
-        finally:
-            # Clean up temporary file
-            if temp_file_path and os.path.exists(temp_file_path):
-                try:
-                    os.unlink(temp_file_path)
-                    logger.debug(f"Cleaned up temporary file: {temp_file_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up temporary file: {e}")
+        Returns:
+            List[PageContent]: Extracted non-empty pages in page order
+        """
+        workers = min(os.cpu_count() or 1, MAX_PAGE_WORKERS)
+        # Contiguous page ranges so every worker opens the document only once
+        step = -(-page_count // workers)
+        page_ranges = [range(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+        
+        global _process_pool_available
+        executor = None
+        if _process_pool_available:
+            try:
+                # Create the pool first so nothing is written to disk where it is unavailable
+                executor = ProcessPoolExecutor(max_workers=len(page_ranges), mp_context=_MP_CONTEXT)
+            except (OSError, NotImplementedError) as e:
+                _process_pool_available = False
+                logger.warning(f"Parallel page extraction unavailable, extracting sequentially from now on: {e}")
+        
+        if executor is not None:
+            try:
+                with executor, tempfile.NamedTemporaryFile(suffix=f".{filetype}") as spill_file:
+                    spill_file.write(data)
+                    spill_file.flush()
+                    results = executor.map(
+                        partial(_extract_pages, spill_file.name, filetype, self.include_image_count),
+                        page_ranges
+                    )
+                    return [page for pages in results for page in pages]
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning(f"Parallel page extraction failed, extracting sequentially: {e}")
+        
+        with _PYMUPDF_LOCK:
+            with pymupdf.open(stream=data, filetype=filetype) as doc:
+                return _read_pages(doc, range(page_count), self.include_image_count)
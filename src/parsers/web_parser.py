@@ -1,13 +1,46 @@
 import asyncio
+import atexit
 import logging
-from typing import List, Dict, Any
-from chonkie import SentenceChunker
+import threading
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, AsyncIterator, Coroutine, Optional, Tuple
+from cachetools import TTLCache
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
 from .base_parser import BaseParser
-from ..models.messages import SpringAIDocument, ProcessRequestMessage
+from .chunking import get_chunker
+from ..models.messages import SpringAIDocument, ProcessRequestMessage, ChunkMetadata
 
 logger = logging.getLogger(__name__)
 
+# Background event loop shared by all crawls so async resources outlive a single call
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+
+# How long to wait for the browser to shut down at interpreter exit
+CLOSE_TIMEOUT_SECONDS = 10
+
+# Successful crawls keyed on (url, page_timeout) so repeat ingests skip the browser.
+# Bounded by markdown size rather than entry count, since a single page can be
+# megabytes. Only touched from the shared event loop thread, so no locking is needed.
+URL_CACHE_MAX_CHARS = 64 * 1024 * 1024
+_URL_CACHE: TTLCache = TTLCache(maxsize=URL_CACHE_MAX_CHARS, ttl=3600, getsizeof=lambda content: len(content["markdown"]))
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, starting its thread on first use"""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="web-parser-loop", daemon=True).start()
+            _LOOP = loop
+        return _LOOP
+
+
+def _run_on_loop(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared event loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result(timeout)
+
 
 class WebParser(BaseParser):
     """
@@ -18,7 +51,67 @@ class WebParser(BaseParser):
     
     def __init__(self):
         """Initialize the WebParser."""
-        pass
+        # Configure browser for crawling (Lambda-compatible)
+        self._browser_config = BrowserConfig(
+            verbose=False,  # Reduce verbosity for Lambda
+            headless=True,
+            user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            # Lambda-specific Chrome flags to handle sandbox restrictions
+            extra_args=[
+                "--no-sandbox",
+                "--disable-setuid-sandbox", 
+                "--disable-dev-shm-usage",
+                "--disable-gpu",
+                "--disable-gpu-compositing",
+                "--disable-software-rasterizer",
+                "--disable-background-timer-throttling",
+                "--disable-backgrounding-occluded-windows",
+                "--disable-renderer-backgrounding",
+                "--disable-features=TranslateUI",
+                "--disable-ipc-flooding-protection",
+                "--disable-extensions",
+                "--disable-default-apps",
+                "--disable-sync",
+                "--metrics-recording-only",
+                "--no-first-run",
+                "--safebrowsing-disable-auto-update",
+                "--disable-component-extensions-with-background-pages",
+                "--disable-background-networking",
+                "--disable-component-update",
+                "--disable-client-side-phishing-detection",
+                "--disable-hang-monitor",
+                "--disable-popup-blocking",
+                "--disable-prompt-on-repost",
+                "--ignore-certificate-errors",
+                "--ignore-ssl-errors",
+                "--ignore-certificate-errors-spki-list",
+                "--disable-web-security",
+                "--allow-running-insecure-content",
+                "--disable-features=VizDisplayCompositor",
+                "--single-process"  # Run in single process mode for Lambda
+            ]
+        )
+        
+        # Configure crawling behavior with minimal settings for Lambda
+        self._run_config = CrawlerRunConfig(
+            word_count_threshold=1,
+            exclude_external_links=False,
+            cache_mode=CacheMode.DISABLED,
+            page_timeout=30000,  # 30 seconds timeout for Lambda
+            delay_before_return_html=2.0,  # Wait 2 seconds for content to load
+            screenshot=False,
+            pdf=False,
+            only_text=True,  # Extract only text content
+        )
+        
+        # Browser is launched on first crawl and kept warm between requests.
+        # Record threads crawl through it concurrently, so it is only closed
+        # once every in-flight crawl has finished.
+        self._crawler: Optional[AsyncWebCrawler] = None
+        self._crawler_state = asyncio.Condition()
+        self._active_crawls = 0
+        self._reset_requested = False
+        atexit.register(self.close)
     
     def parse(self, request: ProcessRequestMessage, chunk_size: int = 512, overlap: int = 128) -> List[SpringAIDocument]:
         """
@@ -36,114 +129,24 @@ class WebParser(BaseParser):
             Exception: If crawling fails
         """
         try:
-            logger.info(f"=== WEB PARSER DEBUG START ===")
-            logger.info(f"Processing web URL: {request.web_url}")
-            logger.info(f"Request content_type: {request.content_type}")
-            logger.info(f"Request name: {request.name}")
-            
-            # Run the async crawling
-            logger.info("Starting web crawling...")
-            try:
-                loop = asyncio.get_running_loop()
-                logger.info("Running in async context, using ThreadPoolExecutor")
-                # If we're already in an async context, create a task
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, self._crawl_url(request.web_url))
-                    web_content = future.result()
-            except RuntimeError:
-                logger.info("No running async loop, using asyncio.run directly")
-                # No running loop, safe to use asyncio.run
-                web_content = asyncio.run(self._crawl_url(request.web_url))
-            
-            logger.info(f"Crawling completed. Result: {web_content}")
-            
-            if not web_content:
-                logger.error("web_content is None or empty!")
-                raise Exception("Failed to extract content from web URL")
-            
-            logger.info(f"Web content success: {web_content.get('success')}")
-            logger.info(f"Web content keys: {list(web_content.keys())}")
-            
-            # Extract metadata from the crawl result
-            web_metadata = {
-                "url": request.web_url,
-                "title": web_content.get("title", ""),
-                "source": request.web_url,
-                "content_length": len(web_content.get("markdown", "")),
-                "success": web_content.get("success", False)
-            }
-            logger.info(f"Web metadata: {web_metadata}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Processing web URL: {request.web_url}")
+                logger.debug(f"Request content_type: {request.content_type}")
+                logger.debug(f"Request name: {request.name}")
             
-            # Get the markdown content for chunking
-            content_text = web_content.get("markdown", "").strip()
-            logger.info(f"Content text length: {len(content_text)}")
-            logger.info(f"Content text preview (first 200 chars): {content_text[:200] if content_text else 'EMPTY'}")
+            # Run the async crawling on the shared background loop; this works
+            # whether or not the caller is already inside an event loop
+            web_content = _run_on_loop(self._crawl_url(request.web_url))
             
+            content_text = self._content_text(request, web_content)
             if not content_text:
-                logger.warning(f"No content extracted from URL: {request.web_url}")
-                logger.warning(f"Raw web_content: {web_content}")
                 return []
             
-            # Initialize Chonkie SentenceChunker
-            logger.info("Initializing Chonkie SentenceChunker...")
-            chunker = SentenceChunker(
-                tokenizer_or_token_counter="gpt2",
-                chunk_size=chunk_size,
-                chunk_overlap=overlap,
-                min_sentences_per_chunk=1
-            )
-            
-            spring_ai_documents = []
-            global_chunk_index = 0
+            # Use the shared Chonkie SentenceChunker to chunk the web content
+            chonkie_chunks = get_chunker(chunk_size, overlap).chunk(content_text)
+            spring_ai_documents = self._build_documents(request, web_content, chonkie_chunks)
             
-            # Use Chonkie to chunk the web content
-            logger.info("Starting content chunking...")
-            chonkie_chunks = chunker.chunk(content_text)
-            logger.info(f"Chonkie created {len(chonkie_chunks)} chunks")
-            
-            for chonkie_chunk in chonkie_chunks:
-                logger.info(f"Processing chunk {global_chunk_index}: {len(chonkie_chunk.text)} chars")
-                # Create metadata with important generic fields first
-                chunk_metadata = {
-                    # Important generic fields for all parsers
-                    "knowledge_id": request.content_id,
-                    "processing_timestamp": request.timestamp,
-                    # "project_id": request.project_id,
-                    # "user_id": request.user_id,
-                    "name": request.name,
-                    "mime_type": request.mime_type,
-                    # "file_size": request.file_size,
-                    "url":request.web_url,
-                    # "s3_bucket": request.s3_bucket,
-                    # "s3_key": request.s3_key,  # This is the URL for web content
-                    
-                    # Chunking metadata
-                    "chunk_index": global_chunk_index,
-                    "token_count": chonkie_chunk.token_count,
-                    "chunk_start_index": chonkie_chunk.start_index,
-                    "chunk_end_index": chonkie_chunk.end_index,
-                    
-                    # Format-specific data in additional_payload
-                    "additional_payload": {
-                        # Web-specific metadata
-                        "url": web_metadata["url"],
-                        "web_title": web_metadata["title"],
-                        "content_length": web_metadata["content_length"],
-                        "crawl_success": web_metadata["success"]
-                    }
-                }
-                
-                # Create SpringAIDocument
-                spring_ai_doc = SpringAIDocument(
-                    content=chonkie_chunk.text,
-                    metadata=chunk_metadata
-                )
-                spring_ai_documents.append(spring_ai_doc)
-                global_chunk_index += 1
-            
-            logger.info(f"=== WEB PARSER DEBUG END ===")
-            logger.info(f"Successfully processed web URL into {len(spring_ai_documents)} chunks")
+            logger.info(f"Successfully processed web URL {request.web_url} into {len(spring_ai_documents)} chunks")
             return spring_ai_documents
             
         except Exception as e:
@@ -154,129 +157,321 @@ class WebParser(BaseParser):
             logger.error(f"Stack trace: {traceback.format_exc()}")
             raise Exception(f"Failed to parse web URL {request.web_url}: {str(e)}")
     
-    async def _crawl_url(self, url: str) -> Dict[str, Any]:
+    def parse_batch(self, requests: List[ProcessRequestMessage], chunk_size: int = 512, overlap: int = 128) -> List[List[SpringAIDocument]]:
         """
-        Crawl a URL using Crawl4AI and extract content.
+        Parse several web URLs at once, crawling them concurrently in the shared browser.
         
         Args:
-            url: The URL to crawl
+            requests: The processing requests containing web URLs and metadata
+            chunk_size: Maximum tokens per chunk (default: 512)
+            overlap: Number of tokens to overlap between chunks (default: 128)
             
         Returns:
-            Dict containing the crawled content and metadata
+            List[List[SpringAIDocument]]: Web content chunks for each request, in request order
+            
+        Raises:
+            Exception: If crawling fails
         """
+        if not requests:
+            return []
+        
         try:
-            logger.info(f"=== CRAWL4AI DEBUG START for {url} ===")
+            logger.info(f"Processing {len(requests)} web URLs in one batch")
             
-            # Configure browser for crawling (Lambda-compatible)
-            browser_config = BrowserConfig(
-                verbose=False,  # Reduce verbosity for Lambda
-                headless=True,
-                user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                # Lambda-specific Chrome flags to handle sandbox restrictions
-                extra_args=[
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox", 
-                    "--disable-dev-shm-usage",
-                    "--disable-gpu",
-                    "--disable-gpu-compositing",
-                    "--disable-software-rasterizer",
-                    "--disable-background-timer-throttling",
-                    "--disable-backgrounding-occluded-windows",
-                    "--disable-renderer-backgrounding",
-                    "--disable-features=TranslateUI",
-                    "--disable-ipc-flooding-protection",
-                    "--disable-extensions",
-                    "--disable-default-apps",
-                    "--disable-sync",
-                    "--metrics-recording-only",
-                    "--no-first-run",
-                    "--safebrowsing-disable-auto-update",
-                    "--disable-component-extensions-with-background-pages",
-                    "--disable-background-networking",
-                    "--disable-component-update",
-                    "--disable-client-side-phishing-detection",
-                    "--disable-hang-monitor",
-                    "--disable-popup-blocking",
-                    "--disable-prompt-on-repost",
-                    "--ignore-certificate-errors",
-                    "--ignore-ssl-errors",
-                    "--ignore-certificate-errors-spki-list",
-                    "--disable-web-security",
-                    "--allow-running-insecure-content",
-                    "--disable-features=VizDisplayCompositor",
-                    "--single-process"  # Run in single process mode for Lambda
-                ]
-            )
-            logger.info(f"Browser config created")
+            web_contents = _run_on_loop(self._crawl_many([request.web_url for request in requests]))
+            content_texts = [
+                self._content_text(request, web_content)
+                for request, web_content in zip(requests, web_contents)
+            ]
             
-            # Configure crawling behavior with minimal settings for Lambda
-            run_config = CrawlerRunConfig(
-                word_count_threshold=1,
-                exclude_external_links=False,
-                cache_mode=CacheMode.DISABLED,
-                page_timeout=30000,  # 30 seconds timeout for Lambda
-                delay_before_return_html=2.0,  # Wait 2 seconds for content to load
-                screenshot=False,
-                pdf=False,
-                only_text=True,  # Extract only text content
+            # Chunk every non-empty page in a single Chonkie batch
+            indexes = [index for index, content_text in enumerate(content_texts) if content_text]
+            batch_chunks = get_chunker(chunk_size, overlap).chunk_batch(
+                [content_texts[index] for index in indexes], show_progress=False
             )
-            logger.info(f"Run config created")
             
-            logger.info("Creating AsyncWebCrawler...")
-            async with AsyncWebCrawler(config=browser_config) as crawler:
-                logger.info(f"Starting crawl for URL: {url}")
-                result = await crawler.arun(url=url, config=run_config)
-                
-                logger.info(f"=== CRAWL RESULT ===")
-                logger.info(f"URL: {url}")
-                logger.info(f"Success: {result.success}")
-                logger.info(f"Status code: {getattr(result, 'status_code', 'N/A')}")
-                logger.info(f"Error message: {getattr(result, 'error_message', 'N/A')}")
-                
-                if hasattr(result, 'markdown'):
-                    logger.info(f"Markdown exists: {result.markdown is not None}")
-                    if result.markdown:
-                        logger.info(f"Markdown length: {len(result.markdown)}")
-                        logger.info(f"Markdown preview (first 200 chars): {result.markdown[:200]}")
-                    else:
-                        logger.warning("Markdown is None or empty!")
-                else:
-                    logger.warning("Result has no markdown attribute!")
-                    
-                if hasattr(result, 'html'):
-                    logger.info(f"HTML exists: {result.html is not None}")
-                    if result.html:
-                        logger.info(f"HTML length: {len(result.html)}")
-                    else:
-                        logger.warning("HTML is None or empty!")
-                else:
-                    logger.warning("Result has no html attribute!")
-                
-                if hasattr(result, 'metadata') and result.metadata:
-                    logger.info(f"Metadata: {result.metadata}")
-                else:
-                    logger.warning("No metadata found!")
+            results: List[List[SpringAIDocument]] = [[] for _ in requests]
+            for index, chonkie_chunks in zip(indexes, batch_chunks):
+                results[index] = self._build_documents(requests[index], web_contents[index], chonkie_chunks)
+            
+            logger.info(f"Successfully processed {len(requests)} web URLs into {sum(len(documents) for documents in results)} chunks")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error processing web URL batch: {e}")
+            raise Exception(f"Failed to parse web URL batch: {str(e)}")
+    
+    def _content_text(self, request: ProcessRequestMessage, web_content: Dict[str, Any]) -> str:
+        """
+        Get the markdown text to chunk from a crawl result.
+        
+        Args:
+            request: The processing request the content was crawled for
+            web_content: Crawled content returned by _crawl_url
+            
+        Returns:
+            str: Stripped markdown, empty if nothing was extracted
+            
+        Raises:
+            Exception: If the crawl returned no result at all
+        """
+        if not web_content:
+            logger.error("web_content is None or empty!")
+            raise Exception("Failed to extract content from web URL")
+        
+        content_text = web_content.get("markdown", "").strip()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Web content success: {web_content.get('success')}")
+            logger.debug(f"Content text length: {len(content_text)}")
+        
+        if not content_text:
+            logger.warning(f"No content extracted from URL: {request.web_url}")
+        return content_text
+    
+    def _build_documents(self, request: ProcessRequestMessage, web_content: Dict[str, Any], chonkie_chunks: List[Any]) -> List[SpringAIDocument]:
+        """
+        Wrap the chunks of one crawled page in SpringAI documents.
+        
+        Args:
+            request: The processing request the content was crawled for
+            web_content: Crawled content returned by _crawl_url
+            chonkie_chunks: Chonkie chunks of the page markdown
+            
+        Returns:
+            List[SpringAIDocument]: Web content chunks with metadata
+        """
+        # Extract metadata from the crawl result
+        web_metadata = {
+            "url": request.web_url,
+            "title": web_content.get("title", ""),
+            "source": request.web_url,
+            "content_length": len(web_content.get("markdown", "")),
+            "success": web_content.get("success", False)
+        }
+        
+        # Web specific top-level fields, identical for every chunk
+        web_fields = {
+            "url": request.web_url,
+        }
+        
+        # Format-specific data in additional_payload
+        web_payload = {
+            # Web-specific metadata
+            "url": web_metadata["url"],
+            "web_title": web_metadata["title"],
+            "content_length": web_metadata["content_length"],
+            "crawl_success": web_metadata["success"]
+        }
+        
+        # Every chunk becomes one document, so the list can be sized up front
+        spring_ai_documents = [None] * len(chonkie_chunks)
+        global_chunk_index = 0
+        
+        for chonkie_chunk in chonkie_chunks:
+            chunk_metadata = ChunkMetadata(
+                # Important generic fields for all parsers
+                knowledge_id=request.content_id,
+                processing_timestamp=request.timestamp,
+                name=request.name,
+                mime_type=request.mime_type,
                 
-                return {
-                    "success": result.success,
-                    "markdown": result.markdown if hasattr(result, 'markdown') and result.markdown else "",
-                    "title": result.metadata.get('title', '') if hasattr(result, 'metadata') and result.metadata else "",
-                    "html": result.html if hasattr(result, 'html') and result.html else "",
-                    "status_code": result.status_code if hasattr(result, 'status_code') else None,
-                    "error_message": result.error_message if hasattr(result, 'error_message') and not result.success else ""
-                }
+                # Chunking metadata
+                chunk_index=global_chunk_index,
+                token_count=chonkie_chunk.token_count,
+                chunk_start_index=chonkie_chunk.start_index,
+                chunk_end_index=chonkie_chunk.end_index,
                 
+                # Copied so each chunk's metadata can be changed on its own
+                additional_payload=dict(web_payload),
+                extra=dict(web_fields)
+            )
+            
+            # Create SpringAIDocument
+            spring_ai_doc = SpringAIDocument(
+                content=chonkie_chunk.text,
+                metadata=chunk_metadata
+            )
+            spring_ai_documents[global_chunk_index] = spring_ai_doc
+            global_chunk_index += 1
+        
+        return spring_ai_documents
+    
+    async def _crawl_url(self, url: str) -> Dict[str, Any]:
+        """
+        Crawl a URL using Crawl4AI and extract content.
+        
+        Args:
+            url: The URL to crawl
+            
+        Returns:
+            Dict containing the crawled content and metadata
+        """
+        cached = _URL_CACHE.get(self._cache_key(url))
+        if cached is not None:
+            logger.debug("Using cached crawl for URL: %s", url)
+            return cached
+        
+        crawler = None
+        try:
+            async with self._use_crawler() as crawler:
+                logger.debug("Starting crawl for URL: %s", url)
+                result = await crawler.arun(url=url, config=self._run_config)
+            return self._cache_content(url, self._result_to_content(url, result))
+            
         except Exception as e:
             logger.error(f"=== CRAWL4AI ERROR for URL {url} ===")
             logger.error(f"Error: {e}")
             logger.error(f"Exception type: {type(e)}")
             import traceback
             logger.error(f"Stack trace: {traceback.format_exc()}")
-            return {
-                "success": False,
-                "markdown": "",
-                "title": "",
-                "html": "",
-                "status_code": None,
-                "error_message": str(e)
-            }
\ No newline at end of file
+            # Relaunch the browser in case this crawl left it broken, once the
+            # other records' crawls through it have finished
+            await self._reset_crawler(crawler)
+            return self._failed_content(str(e))
+    
+    async def _crawl_many(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Crawl several URLs concurrently using Crawl4AI's arun_many.
+        
+        Args:
+            urls: The URLs to crawl
+            
+        Returns:
+            List of dicts containing the crawled content, in the order of urls
+        """
+        contents = {}
+        for url in urls:
+            cached = _URL_CACHE.get(self._cache_key(url))
+            if cached is not None:
+                contents[url] = cached
+        pending = [url for url in dict.fromkeys(urls) if url not in contents]
+        
+        if pending:
+            crawler = None
+            try:
+                async with self._use_crawler() as crawler:
+                    logger.debug("Starting crawl for %d URLs (%d cached)", len(pending), len(contents))
+                    results = await crawler.arun_many(urls=pending, config=self._run_config)
+            except Exception as e:
+                logger.error(f"=== CRAWL4AI ERROR for {len(pending)} URLs ===")
+                logger.error(f"Error: {e}")
+                # Relaunch the browser in case this crawl left it broken, once
+                # the other records' crawls through it have finished
+                await self._reset_crawler(crawler)
+                results = []
+                for url in pending:
+                    contents[url] = self._failed_content(str(e))
+            
+            # arun_many returns results as they complete, not in input order
+            for result in results:
+                contents[result.url] = self._cache_content(result.url, self._result_to_content(result.url, result))
+        
+        return [contents.get(url) or self._failed_content("No crawl result returned") for url in urls]
+    
+    def _cache_key(self, url: str) -> Tuple[str, int]:
+        """Cache key for a URL; includes the page timeout so config changes invalidate entries"""
+        return url, self._run_config.page_timeout
+    
+    def _cache_content(self, url: str, content: Dict[str, Any]) -> Dict[str, Any]:
+        """Remember a successful crawl so the URL is not crawled again while cached"""
+        # Pages larger than the whole cache are not kept (cachetools raises on them)
+        if content.get("success") and content.get("markdown") and len(content["markdown"]) <= _URL_CACHE.maxsize:
+            _URL_CACHE[self._cache_key(url)] = content
+        return content
+    
+    def _result_to_content(self, url: str, result: Any) -> Dict[str, Any]:
+        """
+        Convert a Crawl4AI result into the content dict used by the parser.
+        
+        Args:
+            url: The URL that was crawled
+            result: Crawl4AI CrawlResult for the URL
+            
+        Returns:
+            Dict containing the crawled content and metadata
+        """
+        if not result.success:
+            logger.warning(f"Crawl failed for URL {url}: {getattr(result, 'error_message', '')}")
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Crawled URL {url}: status code {getattr(result, 'status_code', 'N/A')}, "
+                         f"markdown length {len(result.markdown) if getattr(result, 'markdown', None) else 0}, "
+                         f"metadata {getattr(result, 'metadata', None)}")
+        
+        # Only the fields the parser reads are kept; the raw HTML can be megabytes
+        content = {
+            "success": result.success,
+            "markdown": result.markdown if hasattr(result, 'markdown') and result.markdown else "",
+            "title": result.metadata.get('title', '') if hasattr(result, 'metadata') and result.metadata else ""
+        }
+        if not result.success:
+            content["error_message"] = getattr(result, 'error_message', "") or ""
+        return content
+    
+    def _failed_content(self, error_message: str) -> Dict[str, Any]:
+        """Content dict for a URL that could not be crawled"""
+        return {
+            "success": False,
+            "markdown": "",
+            "title": "",
+            "error_message": error_message
+        }
+    
+    @asynccontextmanager
+    async def _use_crawler(self) -> AsyncIterator[AsyncWebCrawler]:
+        """
+        Hold the shared crawler for one crawl, launching the browser on first use.
+        
+        New crawls wait while a reset is pending, so a browser being closed is
+        never handed out.
+        
+        Yields:
+            AsyncWebCrawler: Started crawler bound to the shared event loop
+        """
+        async with self._crawler_state:
+            await self._crawler_state.wait_for(lambda: not self._reset_requested)
+            if self._crawler is None:
+                logger.info("Starting AsyncWebCrawler...")
+                crawler = AsyncWebCrawler(config=self._browser_config)
+                await crawler.start()
+                self._crawler = crawler
+            self._active_crawls += 1
+            crawler = self._crawler
+        try:
+            yield crawler
+        finally:
+            async with self._crawler_state:
+                self._active_crawls -= 1
+                self._crawler_state.notify_all()
+    
+    async def _reset_crawler(self, crawler: Optional[AsyncWebCrawler]) -> None:
+        """
+        Close the shared crawler once no crawls are using it, so the next crawl starts a fresh browser.
+        
+        Args:
+            crawler: The crawler to close; nothing is closed if it is None (the
+                browser never launched) or has already been replaced
+        """
+        async with self._crawler_state:
+            if crawler is None or crawler is not self._crawler:
+                return
+            self._reset_requested = True
+            try:
+                # Another failed crawl may have reset it while this one waited
+                await self._crawler_state.wait_for(lambda: self._active_crawls == 0 or self._crawler is not crawler)
+                if self._crawler is crawler:
+                    self._crawler = None
+                    try:
+                        await crawler.close()
+                    except Exception as e:
+                        logger.warning(f"Failed to close AsyncWebCrawler: {e}")
+            finally:
+                self._reset_requested = False
+                self._crawler_state.notify_all()
+    
+    def close(self) -> None:
+        """Shut down the shared browser; registered to run at interpreter exit"""
+        if self._crawler is not None:
+            try:
+                _run_on_loop(self._reset_crawler(self._crawler), timeout=CLOSE_TIMEOUT_SECONDS)
+            except Exception as e:
+                logger.warning(f"Failed to shut down AsyncWebCrawler: {e}")
\ No newline at end of file
@@ -1,16 +1,26 @@
-import json
 import logging
-import os
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Union
-import boto3
+import orjson
 from botocore.exceptions import ClientError
 
 from src.models.messages import ProcessSuccessMessage, ProcessFailureMessage
+from src.aws.clients import get_sqs_client
 from src.config.settings import AppConfig
 
 logger = logging.getLogger(__name__)
 
+# SendMessageBatch accepts at most 10 entries per call
+SQS_MAX_BATCH_SIZE = 10
+
+
+def _serialize_message(message: Union[ProcessSuccessMessage, ProcessFailureMessage, Dict[str, Any]]) -> str:
+    """Serialize a message model or a prebuilt message dict to a JSON body"""
+    if isinstance(message, dict):
+        return orjson.dumps(message).decode()
+    # Pydantic v2 serializes models through its Rust core already
+    return message.model_dump_json(by_alias=True)
+
 
 class SQSRepositoryInterface(ABC):
     """Interface for SQS operations"""
@@ -19,28 +29,23 @@ class SQSRepositoryInterface(ABC):
     def send_message(self, queue_url: str, message: Union[ProcessSuccessMessage, ProcessFailureMessage, Dict[str, Any]]) -> None:
         """Send a message to the specified SQS queue"""
         pass
+    
+    @abstractmethod
+    def send_message_batch(self, queue_url: str, messages: List[Union[ProcessSuccessMessage, ProcessFailureMessage, Dict[str, Any]]]) -> List[int]:
+        """Send messages to the specified SQS queue in batches, returning the indexes of messages that failed"""
+        pass
 
 
 class SQSRepository(SQSRepositoryInterface):
-    def __init__(self, config: AppConfig):
+    def __init__(self, config: AppConfig, sqs_client=None):
         self.config = config
-        # Initialize SQS client with conditional credentials
-        if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
-            # Use IAM role in Lambda
-            self.sqs_client = boto3.client('sqs')
-        else:
-            # Use explicit credentials for local/development
-            self.sqs_client = boto3.client(
-                'sqs',
-                region_name=config.aws.region,
-                aws_access_key_id=config.aws.access_key_id,
-                aws_secret_access_key=config.aws.secret_access_key
-            )
+        # Shared process-wide client unless one is injected
+        self.sqs_client = sqs_client or get_sqs_client(config)
     
     def send_message(self, queue_url: str, message: Union[ProcessSuccessMessage, ProcessFailureMessage, Dict[str, Any]]) -> None:
         """Send a message to the specified SQS queue"""
         try:
-            message_body = message.model_dump_json(by_alias=True)
+            message_body = _serialize_message(message)
             
             response = self.sqs_client.send_message(
                 QueueUrl=queue_url,
@@ -54,4 +59,33 @@ class SQSRepository(SQSRepositoryInterface):
             raise
         except Exception as e:
             logger.error(f"Unexpected error sending message to queue {queue_url}: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    def send_message_batch(self, queue_url: str, messages: List[Union[ProcessSuccessMessage, ProcessFailureMessage, Dict[str, Any]]]) -> List[int]:
+        """Send messages to the specified SQS queue in batches, returning the indexes of messages that failed"""
+        failed_indexes = []
+        
+        for start in range(0, len(messages), SQS_MAX_BATCH_SIZE):
+            batch = messages[start:start + SQS_MAX_BATCH_SIZE]
+            entries = [
+                {'Id': str(start + i), 'MessageBody': _serialize_message(message)}
+                for i, message in enumerate(batch)
+            ]
+            
+            try:
+                response = self.sqs_client.send_message_batch(
+                    QueueUrl=queue_url,
+                    Entries=entries
+                )
+            except Exception as e:
+                logger.error(f"Failed to send message batch to queue {queue_url}: {e}")
+                failed_indexes.extend(range(start, start + len(batch)))
+                continue
+            
+            for failed in response.get('Failed', []):
+                logger.error(f"Failed to send message {failed['Id']} to queue {queue_url}: {failed.get('Message')}")
+                failed_indexes.append(int(failed['Id']))
+            
+            logger.info(f"Sent {len(response.get('Successful', []))} messages to queue {queue_url}")
+        
+        return failed_indexes
\ No newline at end of file
@@ -1,17 +1,70 @@
 from abc import ABC, abstractmethod
-from typing import List
-import boto3
-import json
+from typing import BinaryIO, List
+import gzip
 import logging
-import os
-from botocore.exceptions import ClientError
+import tempfile
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
+from s3transfer.exceptions import RetriesExceededError
+from pydantic import TypeAdapter
 
+from src.aws.clients import get_s3_client
 from src.config.settings import AppConfig
 from src.models.messages import SpringAIDocument
 from src.exceptions.processing_exceptions import S3UploadException, S3DownloadException
 
 logger = logging.getLogger(__name__)
 
+# Multipart upload above 8 MB, as 8 MB parts with up to 10 in flight
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+
+# Fast gzip level; chunk JSON is repetitive enough to compress well at low levels
+UPLOAD_GZIP_LEVEL = 3
+
+# Serializes one chunk document to JSON bytes in pydantic-core
+DOCUMENT_ADAPTER = TypeAdapter(SpringAIDocument)
+
+# Encoded uploads stay in memory up to this size, then spill to /tmp
+UPLOAD_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Large downloads are fetched as parallel 8 MB byte-range GETs
+DOWNLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8
+)
+
+# S3 error codes that are worth retrying even though some come with a 4xx status
+TRANSIENT_S3_ERROR_CODES = frozenset({
+    "SlowDown", "Throttling", "ThrottlingException", "RequestTimeout",
+    "RequestLimitExceeded", "InternalError", "ServiceUnavailable"
+})
+
+# Connection drops, timeouts and exhausted transfer retries while downloading
+DOWNLOAD_TRANSIENT_EXCEPTIONS = (BotoConnectionError, HTTPClientError, RetriesExceededError)
+
+
+def _is_transient_client_error(error: ClientError) -> bool:
+    """Whether an S3 ClientError is throttling or a server error, rather than e.g. a missing key or denied access"""
+    status_code = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+    error_code = error.response.get('Error', {}).get('Code', '')
+    return status_code >= 500 or status_code == 429 or error_code in TRANSIENT_S3_ERROR_CODES
+
+
+def _write_documents_json(documents: List[SpringAIDocument], fileobj: BinaryIO) -> None:
+    """Write documents to fileobj as a compact JSON array, one document at a time"""
+    fileobj.write(b'[')
+    for index, document in enumerate(documents):
+        if index:
+            fileobj.write(b',')
+        fileobj.write(DOCUMENT_ADAPTER.dump_json(document))
+    fileobj.write(b']')
+
 
 class S3ServiceInterface(ABC):
     @abstractmethod
@@ -21,45 +74,50 @@ class S3ServiceInterface(ABC):
     @abstractmethod
     def download_file(self, s3_key: str, s3_bucket: str) -> bytes:
         pass
+    
+    @abstractmethod
+    def download_to_fileobj(self, s3_key: str, s3_bucket: str, fileobj: BinaryIO) -> None:
+        pass
 
 
 class S3Service(S3ServiceInterface):
-    def __init__(self, config: AppConfig):
+    def __init__(self, config: AppConfig, s3_client=None):
         self.config = config
-        # Check if running in Lambda (AWS_LAMBDA_FUNCTION_NAME is set by Lambda)
-        if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
-            # In Lambda: use IAM role, don't specify credentials
-            self.s3_client = boto3.client('s3', region_name=config.aws.region)
-        else:
-            # Locally: use explicit credentials
-            self.s3_client = boto3.client(
-                's3',
-                region_name=config.aws.region,
-                aws_access_key_id=config.aws.access_key_id,
-                aws_secret_access_key=config.aws.secret_access_key
-            )
+        # Shared process-wide client unless one is injected
+        self.s3_client = s3_client or get_s3_client(config)
     
     def upload_processed_documents(self, documents: List[SpringAIDocument], content_id: str) -> str:
         try:
-            # Convert documents to dict format
-            documents_dict = [doc.dict() for doc in documents]
-            documents_json = json.dumps(documents_dict, indent=2)
+            extra_args = {'ContentType': 'application/json'}
+            if self.config.s3.compress_uploads:
+                extra_args['ContentEncoding'] = 'gzip'
             
             # Generate S3 key for processed documents
             s3_key = f"processed/{content_id}-chunks.json"
             
-            # Upload to S3
-            self.s3_client.put_object(
-                Bucket=self.config.s3.bucket_name,
-                Key=s3_key,
-                Body=documents_json,
-                ContentType='application/json'
-            )
+            # Encode the documents one at a time into a spooled file so the full
+            # JSON string is never held in memory next to the documents
+            with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_SIZE) as body:
+                if self.config.s3.compress_uploads:
+                    with gzip.GzipFile(fileobj=body, mode='wb', compresslevel=UPLOAD_GZIP_LEVEL) as gzip_body:
+                        _write_documents_json(documents, gzip_body)
+                else:
+                    _write_documents_json(documents, body)
+                body.seek(0)
+                
+                # Upload to S3, switching to multipart for large chunk sets
+                self.s3_client.upload_fileobj(
+                    body,
+                    Bucket=self.config.s3.bucket_name,
+                    Key=s3_key,
+                    ExtraArgs=extra_args,
+                    Config=UPLOAD_TRANSFER_CONFIG
+                )
             
             logger.info(f"Successfully uploaded processed documents to s3://{self.config.s3.bucket_name}/{s3_key}")
             return s3_key
             
-        except ClientError as e:
+        except (ClientError, S3UploadFailedError) as e:
             logger.error(f"Error uploading to S3: {e}")
             raise S3UploadException(f"Failed to upload processed documents: {str(e)}")
     
@@ -75,5 +133,26 @@ class S3Service(S3ServiceInterface):
             return file_content
             
         except ClientError as e:
+            logger.error(f"Error downloading from S3: {e}")
+            raise S3DownloadException(f"Failed to download file {s3_key}: {str(e)}", retryable=_is_transient_client_error(e))
+        except DOWNLOAD_TRANSIENT_EXCEPTIONS as e:
+            logger.error(f"Error downloading from S3: {e}")
+            raise S3DownloadException(f"Failed to download file {s3_key}: {str(e)}")
+    
+    def download_to_fileobj(self, s3_key: str, s3_bucket: str, fileobj: BinaryIO) -> None:
+        try:
+            # Streams straight into fileobj instead of holding the whole file in memory
+            self.s3_client.download_fileobj(
+                Bucket=s3_bucket,
+                Key=s3_key,
+                Fileobj=fileobj,
+                Config=DOWNLOAD_TRANSFER_CONFIG
+            )
+            logger.info(f"Successfully downloaded file from s3://{s3_bucket}/{s3_key}")
+            
+        except ClientError as e:
+            logger.error(f"Error downloading from S3: {e}")
+            raise S3DownloadException(f"Failed to download file {s3_key}: {str(e)}", retryable=_is_transient_client_error(e))
+        except DOWNLOAD_TRANSIENT_EXCEPTIONS as e:
             logger.error(f"Error downloading from S3: {e}")
             raise S3DownloadException(f"Failed to download file {s3_key}: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+# Settings are read from the environment when src.config.settings is imported
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_REGION", "ap-south-1")
+os.environ.setdefault("PROCESS_QUEUE_URL", "https://sqs.ap-south-1.amazonaws.com/123456789012/process")
+os.environ.setdefault("PROCESSING_QUEUE_URL", "https://sqs.ap-south-1.amazonaws.com/123456789012/processing")
+os.environ.setdefault("S3_BUCKET_NAME", "test-bucket")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chonkie import SentenceChunker  # noqa: E402
+
+from src.parsers import document_parser, web_parser  # noqa: E402
+
+
+def _word_chunker(chunk_size: int, overlap: int) -> SentenceChunker:
+    """SentenceChunker counting words, so tests need no GPT-2 tokenizer download"""
+    chunker = SentenceChunker(
+        tokenizer_or_token_counter=lambda text: len(text.split()),
+        chunk_size=chunk_size,
+        chunk_overlap=overlap,
+        min_sentences_per_chunk=1
+    )
+    chunker._use_multiprocessing = False
+    return chunker
+
+
+@pytest.fixture(autouse=True)
+def word_chunker(monkeypatch):
+    monkeypatch.setattr(document_parser, "get_chunker", _word_chunker)
+    monkeypatch.setattr(web_parser, "get_chunker", _word_chunker)
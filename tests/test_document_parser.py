@@ -0,0 +1,117 @@
+import pymupdf
+
+from src.models.messages import ProcessRequestMessage
+from src.parsers import document_parser
+from src.parsers.document_parser import DocumentParser
+
+
+class InMemoryS3:
+    """S3 service stub serving one document from memory"""
+    
+    def __init__(self, data: bytes):
+        self.data = data
+    
+    def download_to_fileobj(self, s3_key, s3_bucket, fileobj):
+        fileobj.write(self.data)
+
+
+def _pdf(page_count: int, with_image: bool = False) -> bytes:
+    doc = pymupdf.open()
+    for page_index in range(page_count):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {page_index + 1} says hello. It has two sentences.")
+        if with_image:
+            pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 4, 4), False)
+            page.insert_image(pymupdf.Rect(72, 100, 144, 172), pixmap=pixmap)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _request() -> ProcessRequestMessage:
+    return ProcessRequestMessage(
+        contentId="content-1",
+        contentType="document",
+        name="file.pdf",
+        mimeType="application/pdf",
+        projectId="project",
+        userId="user",
+        s3Key="uploads/file.pdf",
+        s3Bucket="source-bucket",
+        fileSize=2048
+    )
+
+
+def test_page_metadata_omits_image_count_by_default():
+    documents = DocumentParser(InMemoryS3(_pdf(2, with_image=True))).parse(_request())
+    
+    assert [document.metadata.additional_payload["page_number"] for document in documents] == [1, 2]
+    assert all("page_image_count" not in document.metadata.additional_payload for document in documents)
+    assert documents[0].metadata.extra == {"file_size": 2048}
+
+
+def test_page_metadata_includes_image_count_when_enabled():
+    parser = DocumentParser(InMemoryS3(_pdf(2, with_image=True)), include_image_count=True)
+    
+    documents = parser.parse(_request())
+    
+    assert all(document.metadata.additional_payload["page_image_count"] == 1 for document in documents)
+
+
+def test_chunks_do_not_share_metadata_dicts():
+    documents = DocumentParser(InMemoryS3(_pdf(1))).parse(_request(), chunk_size=8, overlap=0)
+    
+    first, second = documents[:2]
+    first.metadata.additional_payload["tag"] = "first"
+    first.metadata.extra["tag"] = "first"
+    
+    assert first.metadata.additional_payload["page_number"] == second.metadata.additional_payload["page_number"]
+    assert "tag" not in second.metadata.additional_payload
+    assert "tag" not in second.metadata.extra
+
+def test_unavailable_process_pool_is_remembered(monkeypatch):
+    calls = []
+    
+    def unavailable_pool(*args, **kwargs):
+        calls.append(kwargs)
+        raise OSError("[Errno 38] Function not implemented")
+    
+    monkeypatch.setattr(document_parser, "ProcessPoolExecutor", unavailable_pool)
+    monkeypatch.setattr(document_parser, "_process_pool_available", True)
+    parser = DocumentParser(InMemoryS3(_pdf(document_parser.PARALLEL_PAGE_THRESHOLD)))
+    
+    first = parser.parse(_request())
+    second = parser.parse(_request())
+    
+    # Pages are still extracted sequentially, and the pool is only tried once
+    assert len(calls) == 1
+    assert document_parser._process_pool_available is False
+    assert [document.content for document in first] == [document.content for document in second]
+    assert len({document.metadata.additional_payload["page_number"] for document in first}) == document_parser.PARALLEL_PAGE_THRESHOLD
+
+
+def test_parallel_extraction_matches_sequential(monkeypatch, caplog):
+    pools = []
+    real_pool = document_parser.ProcessPoolExecutor
+    
+    def recording_pool(*args, **kwargs):
+        pools.append(kwargs)
+        return real_pool(*args, **kwargs)
+    
+    monkeypatch.setattr(document_parser, "ProcessPoolExecutor", recording_pool)
+    monkeypatch.setattr(document_parser, "_process_pool_available", True)
+    data = _pdf(document_parser.PARALLEL_PAGE_THRESHOLD)
+    request = _request()
+    
+    parallel = DocumentParser(InMemoryS3(data)).parse(request)
+    
+    # The pages really came from worker processes, not the sequential fallback
+    assert len(pools) == 1
+    assert document_parser._process_pool_available is True
+    assert "Parallel page extraction" not in caplog.text
+    
+    monkeypatch.setattr(document_parser, "PARALLEL_PAGE_THRESHOLD", document_parser.PARALLEL_PAGE_THRESHOLD + 1)
+    sequential = DocumentParser(InMemoryS3(data)).parse(request)
+    
+    assert len(pools) == 1
+    assert parallel == sequential
@@ -0,0 +1,217 @@
+import logging
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
+from s3transfer.exceptions import RetriesExceededError
+
+import lambda_handler
+from src.config.settings import AppConfig, get_config
+from src.exceptions.processing_exceptions import DocumentProcessingException, S3DownloadException
+from src.handler import Handler
+from src.models.messages import ProcessRequestMessage
+from src.services.s3_service import S3Service
+
+
+def _record(message_id: str, **overrides) -> dict:
+    body = {
+        "contentId": f"content-{message_id}",
+        "contentType": "document",
+        "name": "file.pdf",
+        "mimeType": "application/pdf",
+        "projectId": "project",
+        "userId": "user",
+        "s3Key": "uploads/file.pdf",
+        "s3Bucket": "source-bucket",
+        **overrides
+    }
+    return {"messageId": message_id, "body": ProcessRequestMessage(**body).model_dump_json(by_alias=True)}
+
+
+class FailingDownloadS3:
+    def download_to_fileobj(self, s3_key, s3_bucket, fileobj):
+        raise S3DownloadException(f"Failed to download file {s3_key}: timed out")
+    
+    def upload_processed_documents(self, documents, content_id):
+        raise AssertionError("upload must not run after a failed download")
+
+
+class FakeHandler:
+    """Handler raising the error configured for a content ID, or returning no documents"""
+    
+    def __init__(self, errors):
+        self.errors = errors
+    
+    def handle(self, request):
+        error = self.errors.get(request.content_id)
+        if error is not None:
+            raise error
+        return []
+
+
+class FakeS3:
+    def upload_processed_documents(self, documents, content_id):
+        return f"processed/{content_id}-chunks.json"
+
+
+class FakeSQS:
+    def __init__(self, failed_indexes=(), error=None):
+        self.failed_indexes = list(failed_indexes)
+        self.error = error
+        self.sent = []
+    
+    def send_message_batch(self, queue_url, messages):
+        if self.error is not None:
+            raise self.error
+        self.sent.extend(messages)
+        return self.failed_indexes
+
+
+@pytest.fixture
+def state(monkeypatch):
+    """Point the Lambda handler at fake services"""
+    fake_state = types.SimpleNamespace(
+        ready=True,
+        config=get_config(),
+        s3=FakeS3(),
+        handler=FakeHandler({}),
+        sqs=FakeSQS(),
+        executor=ThreadPoolExecutor(max_workers=2)
+    )
+    monkeypatch.setattr(lambda_handler, "_STATE", fake_state)
+    yield fake_state
+    fake_state.executor.shutdown()
+
+
+def _failed_ids(response: dict) -> list:
+    return [item["itemIdentifier"] for item in response["batchItemFailures"]]
+
+
+def test_partial_batch_response_redrives_only_transient_failures(state):
+    state.handler = FakeHandler({
+        "content-m2": S3DownloadException("Failed to download file: timed out"),
+        "content-m3": DocumentProcessingException("Unsupported document"),
+        "content-m4": EndpointConnectionError(endpoint_url="https://s3.ap-south-1.amazonaws.com"),
+        "content-m5": ValueError("bug"),
+    })
+    records = [_record(f"m{index}") for index in range(1, 6)]
+    records.append({"messageId": "m6", "body": "not json"})
+    
+    response = lambda_handler.lambda_handler({"Records": records}, None)
+    
+    # Download and connection errors are redriven, the invalid body is dropped
+    assert _failed_ids(response) == ["m2", "m4"]
+    success, document_failure, unexpected_failure = state.sqs.sent
+    assert success.content_id == "content-m1"
+    assert success.s3_key == "processed/content-m1-chunks.json"
+    assert document_failure["contentId"] == "content-m3"
+    assert document_failure["errorCode"] == "DOCUMENT_PROCESSING_ERROR"
+    assert unexpected_failure["contentId"] == "content-m5"
+    assert unexpected_failure["errorCode"] == "UNEXPECTED_ERROR"
+    assert "ValueError: bug" in unexpected_failure["stackTrace"]
+
+
+def test_failed_result_sends_are_redriven(state):
+    state.sqs = FakeSQS(failed_indexes=[1])
+    
+    response = lambda_handler.lambda_handler({"Records": [_record("m1"), _record("m2"), _record("m3")]}, None)
+    
+    assert _failed_ids(response) == ["m2"]
+    assert len(state.sqs.sent) == 3
+
+
+def test_batch_send_error_redrives_every_record(state):
+    state.sqs = FakeSQS(error=RuntimeError("SQS unavailable"))
+    
+    response = lambda_handler.lambda_handler({"Records": [_record("m1"), _record("m2")]}, None)
+    
+    assert _failed_ids(response) == ["m1", "m2"]
+
+
+def test_download_error_is_redriven():
+    s3_service = FailingDownloadS3()
+    
+    message, failure = lambda_handler._process_record(
+        _record("m1"),
+        handler=Handler(s3_service),
+        s3_service=s3_service,
+        config=get_config()
+    )
+    
+    assert message is None
+    assert failure["messageId"] == "m1"
+    assert failure["errorCode"] == "S3_DOWNLOAD_ERROR"
+    assert failure["failedStep"] == "s3_download"
+
+
+@pytest.mark.parametrize("value, level", [
+    ("DEBUG", logging.DEBUG),
+    ("debug", logging.DEBUG),
+    (" warning ", logging.WARNING),
+    ("verbose", logging.INFO),
+    ("", logging.INFO),
+])
+def test_log_level_is_case_insensitive_with_info_fallback(value, level):
+    assert lambda_handler._log_level(value) == level
+
+def test_image_count_setting_reaches_document_parser(monkeypatch):
+    monkeypatch.setenv("PARSER_INCLUDE_IMAGE_COUNT", "true")
+    monkeypatch.setattr(lambda_handler, "get_config", AppConfig)
+    monkeypatch.setattr(lambda_handler, "_STATE", types.SimpleNamespace(ready=False, sqs=None))
+    
+    state = lambda_handler.get_processor()
+    state.executor.shutdown()
+    
+    assert state.handler.document_parser.include_image_count is True
+
+class FailingDownloadClient:
+    """S3 client stub whose downloads raise the given error"""
+    
+    def __init__(self, error):
+        self.error = error
+    
+    def download_fileobj(self, Bucket, Key, Fileobj, Config=None):
+        raise self.error
+
+
+def _client_error(status_code: int, code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status_code}}, "GetObject")
+
+
+@pytest.mark.parametrize("error", [
+    EndpointConnectionError(endpoint_url="https://source-bucket.s3.ap-south-1.amazonaws.com"),
+    ReadTimeoutError(endpoint_url="https://source-bucket.s3.ap-south-1.amazonaws.com"),
+    RetriesExceededError(ReadTimeoutError(endpoint_url="https://source-bucket.s3.ap-south-1.amazonaws.com")),
+    _client_error(503, "SlowDown"),
+    _client_error(500, "InternalError"),
+])
+def test_transient_download_failure_is_redriven_through_handler(error):
+    s3_service = S3Service(get_config(), s3_client=FailingDownloadClient(error))
+    
+    message, failure = lambda_handler._process_record(
+        _record("m1"),
+        handler=Handler(s3_service),
+        s3_service=s3_service,
+        config=get_config()
+    )
+    
+    assert message is None
+    assert failure["errorCode"] == "S3_DOWNLOAD_ERROR"
+
+
+@pytest.mark.parametrize("error", [_client_error(404, "404"), _client_error(403, "AccessDenied")])
+def test_permanent_download_failure_is_reported_through_handler(error):
+    s3_service = S3Service(get_config(), s3_client=FailingDownloadClient(error))
+    
+    message, failure = lambda_handler._process_record(
+        _record("m1"),
+        handler=Handler(s3_service),
+        s3_service=s3_service,
+        config=get_config()
+    )
+    
+    assert failure is None
+    assert message["contentId"] == "content-m1"
+    assert message["errorCode"] == "S3_DOWNLOAD_ERROR"
+    assert message["failedStep"] == "s3_download"
@@ -0,0 +1,44 @@
+import io
+from typing import List
+
+from pydantic import TypeAdapter
+
+from src.models.messages import ChunkMetadata, SpringAIDocument
+from src.services.s3_service import _write_documents_json
+
+
+def _document(**extra) -> SpringAIDocument:
+    return SpringAIDocument(
+        content="Grüße aus Köln",
+        metadata=ChunkMetadata(
+            knowledge_id="content-1",
+            processing_timestamp="2024-01-01T00:00:00",
+            name="file.pdf",
+            mime_type="application/pdf",
+            chunk_index=0,
+            token_count=3,
+            chunk_start_index=0,
+            chunk_end_index=14,
+            additional_payload={"page_number": 1},
+            extra=extra
+        )
+    )
+
+
+def test_uploaded_documents_round_trip():
+    documents = [_document(file_size=1024), _document(url="https://example.com")]
+    buffer = io.BytesIO()
+    _write_documents_json(documents, buffer)
+    
+    restored = TypeAdapter(List[SpringAIDocument]).validate_json(buffer.getvalue())
+    
+    assert restored == documents
+    assert restored[0].metadata.extra == {"file_size": 1024}
+    assert restored[1].metadata.extra == {"url": "https://example.com"}
+
+
+def test_flat_metadata_keeps_unknown_keys_in_extra():
+    document = SpringAIDocument.model_validate_json(_document(file_size=1024).model_dump_json())
+    
+    assert document.metadata.extra == {"file_size": 1024}
+    assert document.metadata.to_dict()["file_size"] == 1024
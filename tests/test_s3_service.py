@@ -0,0 +1,79 @@
+import gzip
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src.config.settings import get_config
+from src.exceptions.processing_exceptions import S3UploadException
+from src.models.messages import ChunkMetadata, SpringAIDocument
+from src.services.s3_service import S3Service
+
+
+class RecordingS3Client:
+    """S3 client stub keeping the body and arguments of every upload"""
+    
+    def __init__(self, error=None):
+        self.error = error
+        self.uploads = []
+    
+    def upload_fileobj(self, fileobj, Bucket, Key, ExtraArgs=None, Config=None):
+        if self.error is not None:
+            raise self.error
+        self.uploads.append({"body": fileobj.read(), "bucket": Bucket, "key": Key, "extra_args": ExtraArgs})
+
+
+def _document(chunk_index: int) -> SpringAIDocument:
+    return SpringAIDocument(
+        content="Grüße aus Köln",
+        metadata=ChunkMetadata(
+            knowledge_id="content-1",
+            processing_timestamp="2024-01-01T00:00:00",
+            name="file.pdf",
+            mime_type="application/pdf",
+            chunk_index=chunk_index,
+            token_count=3,
+            chunk_start_index=0,
+            chunk_end_index=14,
+            additional_payload={"page_number": 1},
+            extra={"file_size": 1024}
+        )
+    )
+
+
+def test_upload_writes_compact_utf8_json():
+    s3_client = RecordingS3Client()
+    documents = [_document(0), _document(1)]
+    
+    s3_key = S3Service(get_config(), s3_client=s3_client).upload_processed_documents(documents, "content-1")
+    
+    upload = s3_client.uploads[0]
+    assert s3_key == upload["key"] == "processed/content-1-chunks.json"
+    assert upload["bucket"] == "test-bucket"
+    assert upload["extra_args"] == {"ContentType": "application/json"}
+    # No indentation, and non-ASCII text is written as UTF-8 rather than escaped
+    assert b"\n" not in upload["body"]
+    assert "Grüße".encode() in upload["body"]
+    assert json.loads(upload["body"]) == [document.model_dump() for document in documents]
+
+
+def test_upload_gzips_when_enabled(monkeypatch):
+    config = get_config()
+    monkeypatch.setattr(config.s3, "compress_uploads", True)
+    s3_client = RecordingS3Client()
+    
+    S3Service(config, s3_client=s3_client).upload_processed_documents([_document(0)], "content-1")
+    
+    upload = s3_client.uploads[0]
+    assert upload["extra_args"] == {"ContentType": "application/json", "ContentEncoding": "gzip"}
+    assert json.loads(gzip.decompress(upload["body"])) == [_document(0).model_dump()]
+
+
+def test_upload_client_error_raises_upload_exception():
+    error = ClientError({"Error": {"Code": "SlowDown", "Message": "Reduce your request rate"}}, "PutObject")
+    s3_service = S3Service(get_config(), s3_client=RecordingS3Client(error=error))
+    
+    with pytest.raises(S3UploadException) as exc_info:
+        s3_service.upload_processed_documents([_document(0)], "content-1")
+    
+    assert exc_info.value.error_code == "S3_UPLOAD_ERROR"
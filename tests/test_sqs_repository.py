@@ -0,0 +1,63 @@
+import boto3
+import orjson
+from botocore.stub import ANY, Stubber
+
+from src.config.settings import get_config
+from src.repositories.sqs_repository import SQSRepository
+
+QUEUE_URL = "https://sqs.ap-south-1.amazonaws.com/123456789012/processing"
+
+
+def _stubbed_repository():
+    sqs_client = boto3.client("sqs", region_name="ap-south-1")
+    return SQSRepository(get_config(), sqs_client=sqs_client), Stubber(sqs_client)
+
+
+def _entries(start: int, stop: int) -> list:
+    return [{"Id": str(index), "MessageBody": ANY} for index in range(start, stop)]
+
+
+def test_send_message_batch_chunks_and_reports_failed_indexes():
+    repository, stubber = _stubbed_repository()
+    messages = [{"contentId": f"content-{index}"} for index in range(12)]
+    stubber.add_response(
+        "send_message_batch",
+        {"Successful": [], "Failed": [{"Id": "3", "SenderFault": False, "Code": "InternalError"}]},
+        {"QueueUrl": QUEUE_URL, "Entries": _entries(0, 10)}
+    )
+    stubber.add_response(
+        "send_message_batch",
+        {"Successful": [], "Failed": [{"Id": "11", "SenderFault": False, "Code": "InternalError"}]},
+        {"QueueUrl": QUEUE_URL, "Entries": _entries(10, 12)}
+    )
+    
+    with stubber:
+        failed_indexes = repository.send_message_batch(QUEUE_URL, messages)
+    
+    assert failed_indexes == [3, 11]
+    stubber.assert_no_pending_responses()
+
+
+def test_send_message_batch_error_fails_whole_chunk():
+    repository, stubber = _stubbed_repository()
+    messages = [{"contentId": f"content-{index}"} for index in range(12)]
+    stubber.add_client_error("send_message_batch", service_error_code="InternalError")
+    stubber.add_response("send_message_batch", {"Successful": [], "Failed": []})
+    
+    with stubber:
+        failed_indexes = repository.send_message_batch(QUEUE_URL, messages)
+    
+    assert failed_indexes == list(range(10))
+
+
+def test_dict_messages_are_sent_as_json():
+    repository, stubber = _stubbed_repository()
+    message = {"contentId": "content-1", "errorMessage": "Grüße"}
+    stubber.add_response(
+        "send_message_batch",
+        {"Successful": [], "Failed": []},
+        {"QueueUrl": QUEUE_URL, "Entries": [{"Id": "0", "MessageBody": orjson.dumps(message).decode()}]}
+    )
+    
+    with stubber:
+        assert repository.send_message_batch(QUEUE_URL, [message]) == []
@@ -0,0 +1,167 @@
+import asyncio
+import types
+
+import pytest
+from cachetools import TTLCache
+
+from src.models.messages import ProcessRequestMessage
+from src.parsers import web_parser
+from src.parsers.web_parser import WebParser
+
+
+class FakeCrawler:
+    """AsyncWebCrawler stand-in serving canned results and counting crawls"""
+    
+    results = {}
+    crawled = []
+    delays = {}
+    events = []
+    
+    def __init__(self, config=None):
+        pass
+    
+    async def start(self):
+        pass
+    
+    async def close(self):
+        FakeCrawler.events.append("close")
+    
+    async def arun(self, url, config=None):
+        FakeCrawler.crawled.append(url)
+        await asyncio.sleep(FakeCrawler.delays.get(url, 0))
+        if url not in FakeCrawler.results:
+            raise RuntimeError(f"Navigation failed for {url}")
+        FakeCrawler.events.append(url)
+        return FakeCrawler.results[url]
+    
+    async def arun_many(self, urls, config=None):
+        FakeCrawler.crawled.extend(urls)
+        # Completion order, not input order
+        return [FakeCrawler.results[url] for url in reversed(urls)]
+
+
+def _result(url: str, success: bool = True) -> types.SimpleNamespace:
+    return types.SimpleNamespace(
+        url=url,
+        success=success,
+        markdown=f"Welcome to {url}. This page has content." if success else "",
+        metadata={"title": "Example"},
+        error_message="" if success else "net::ERR_CONNECTION_RESET"
+    )
+
+
+def _request(url: str) -> ProcessRequestMessage:
+    return ProcessRequestMessage(
+        contentId="content-1",
+        contentType="web",
+        name="Example",
+        mimeType="text/html",
+        projectId="project",
+        userId="user",
+        webUrl=url
+    )
+
+
+@pytest.fixture
+def crawler(monkeypatch):
+    monkeypatch.setattr(web_parser, "AsyncWebCrawler", FakeCrawler)
+    monkeypatch.setattr(web_parser, "_URL_CACHE", TTLCache(maxsize=200, ttl=3600, getsizeof=web_parser._URL_CACHE.getsizeof))
+    monkeypatch.setattr(FakeCrawler, "results", {})
+    monkeypatch.setattr(FakeCrawler, "crawled", [])
+    monkeypatch.setattr(FakeCrawler, "delays", {})
+    monkeypatch.setattr(FakeCrawler, "events", [])
+    return FakeCrawler
+
+
+def test_batch_results_follow_request_order(crawler):
+    urls = ["https://example.com/a", "https://example.com/b", "https://example.com/c"]
+    for url in urls:
+        crawler.results[url] = _result(url)
+    crawler.results["https://example.com/down"] = _result("https://example.com/down", success=False)
+    
+    results = WebParser().parse_batch([_request(url) for url in urls + ["https://example.com/down"]])
+    
+    # arun_many completes in reverse here, yet results line up with the requests
+    assert [documents[0].metadata.extra["url"] for documents in results[:3]] == urls
+    assert results[3] == []
+
+
+def test_successful_crawl_is_cached(crawler):
+    url = "https://example.com/a"
+    crawler.results[url] = _result(url)
+    parser = WebParser()
+    
+    first = parser.parse(_request(url))
+    second = parser.parse(_request(url))
+    
+    assert crawler.crawled == [url]
+    assert [document.content for document in first] == [document.content for document in second]
+    assert first[0].metadata.extra == {"url": url}
+    assert first[0].metadata.additional_payload["web_title"] == "Example"
+
+
+def test_chunks_do_not_share_metadata_dicts(crawler):
+    url = "https://example.com/a"
+    crawler.results[url] = _result(url)
+    
+    first, second = WebParser().parse(_request(url), chunk_size=4, overlap=0)[:2]
+    first.metadata.additional_payload["tag"] = "first"
+    first.metadata.extra["tag"] = "first"
+    
+    assert "tag" not in second.metadata.additional_payload
+    assert "tag" not in second.metadata.extra
+
+def test_failed_crawl_is_not_cached(crawler):
+    url = "https://example.com/down"
+    crawler.results[url] = _result(url, success=False)
+    parser = WebParser()
+    
+    assert parser.parse(_request(url)) == []
+    assert parser.parse(_request(url)) == []
+    assert crawler.crawled == [url, url]
+
+
+def test_batch_crawls_only_uncached_urls_in_request_order(crawler):
+    urls = ["https://example.com/a", "https://example.com/b", "https://example.com/c"]
+    for url in urls:
+        crawler.results[url] = _result(url)
+    parser = WebParser()
+    parser.parse(_request(urls[0]))
+    
+    results = parser.parse_batch([_request(url) for url in urls + [urls[1]]])
+    
+    assert crawler.crawled == [urls[0], urls[1], urls[2]]
+    assert [documents[0].metadata.extra["url"] for documents in results] == urls + [urls[1]]
+
+
+def test_cache_is_bounded_by_markdown_size(crawler):
+    urls = ["https://example.com/a", "https://example.com/b", "https://example.com/c"]
+    for url in urls:
+        crawler.results[url] = _result(url)
+    crawler.results[urls[2]].markdown *= 10
+    parser = WebParser()
+    
+    for url in urls:
+        parser.parse(_request(url))
+    
+    # The oversized page is not cached, and the cache stays within its size budget
+    assert web_parser._URL_CACHE.currsize <= web_parser._URL_CACHE.maxsize
+    assert set(key[0] for key in web_parser._URL_CACHE) == set(urls[:2])
+
+
+def test_failed_crawl_closes_browser_only_after_other_crawls_finish(crawler):
+    slow_url, bad_url = "https://example.com/slow", "https://example.com/bad"
+    crawler.results[slow_url] = _result(slow_url)
+    crawler.delays[slow_url] = 0.05
+    parser = WebParser()
+    
+    async def crawl_both():
+        return await asyncio.gather(parser._crawl_url(slow_url), parser._crawl_url(bad_url))
+    
+    slow_content, bad_content = web_parser._run_on_loop(crawl_both())
+    
+    assert slow_content["success"] is True
+    assert bad_content["success"] is False
+    # The browser shared with the slow crawl is closed once that crawl is done
+    assert crawler.events == [slow_url, "close"]
+    assert parser._crawler is None